@@ -4,21 +4,55 @@ Main FastAPI Application
 키즈 액티비티 챗봇 백엔드 서버
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from routers import chat, rag, weather, map
 from utils.logger import logger
 from utils.config import get_settings
+from utils.vector_client import get_vector_client
 
 # 설정 로드
 settings = get_settings()
 
+
+def _warm_up():
+    """무거운 싱글톤(VectorDB, RAG, LLM, Agent) 미리 생성"""
+    try:
+        from services.rag_service import get_rag_service
+        from services.llm_service import get_llm_service
+        import services.agent_service  # noqa: F401 (chat 라우터 lazy import 대상)
+        
+        get_vector_client()
+        get_rag_service()
+        get_llm_service()
+        logger.info("🔥 서비스 워밍업 완료")
+    except Exception as e:
+        logger.warning(f"⚠️ 서비스 워밍업 실패 (첫 요청 시 재시도): {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작 시 서비스 워밍업 (백그라운드 실행 → 서버는 바로 요청 수신)"""
+    warm_task = None
+    if settings.WARMUP_ON_STARTUP:
+        warm_task = asyncio.create_task(asyncio.to_thread(_warm_up))
+    yield
+    if warm_task and not warm_task.done():
+        warm_task.cancel()
+
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="키즈 액티비티 챗봇 API",
     description="LangGraph 기반 멀티에이전트 키즈 액티비티 추천 시스템",
     version="1.0.0",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=ORJSONResponse,  # dict 응답을 orjson으로 직렬화
+    lifespan=lifespan
 )
 
 # CORS 설정 (프론트엔드 Vite 개발 서버 포함)
@@ -57,7 +91,6 @@ async def health_check():
     """전체 시스템 헬스 체크"""
     try:
         # VectorDB 상태 확인
-        from utils.vector_client import get_vector_client
         vector_client = get_vector_client()
         vector_info = vector_client.get_collection_info()
         
@@ -91,9 +124,12 @@ if __name__ == "__main__":
     logger.info(f"📘 Swagger UI: {swagger_url}")
     logger.info(f"📕 ReDoc:       {redoc_url}")
     logger.info(f"🏠 Root:        {root_url}")
+    # loop/http="auto": uvloop·httptools가 설치되어 있으면 사용 (Windows는 asyncio 기본 루프)
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=settings.PORT,
-        reload=settings.DEBUG
+        reload=settings.DEBUG,
+        loop="auto",
+        http="auto"
     )
\ No newline at end of file
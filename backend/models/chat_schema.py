@@ -1,6 +1,7 @@
 # models/chat_schema.py
 """Pydantic 스키마 정의 - 프론트엔드 Message 타입과 호환"""
 
+from dataclasses import dataclass
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List, TypedDict
 
@@ -9,6 +10,12 @@ from typing import Optional, Dict, Any, List, TypedDict
 # 기존 Pydantic 스키마 (FastAPI용)
 # ============================================================
 
+class Center(BaseModel):
+    """지도 중심 좌표"""
+    lat: float                        # 위도
+    lng: float                        # 경도
+
+
 class MapMarker(BaseModel):
     """지도 마커 하나를 나타내는 모델"""
     name: str                         # 마커 이름
@@ -19,8 +26,9 @@ class MapMarker(BaseModel):
 
 class MapData(BaseModel):
     """지도 데이터 구조"""
-    center: Dict[str, float] = Field(..., description="지도 중심 좌표 {lat, lng}")
-    markers: List[Dict[str, Any]] = Field(..., description="마커 리스트")
+    center: Center = Field(..., description="지도 중심 좌표 {lat, lng}")
+    markers: List[MapMarker] = Field(..., description="마커 리스트")
+
 
 class ChatRequest(BaseModel):
     message: str = Field(..., description="사용자 메시지")
@@ -32,9 +40,23 @@ class ChatResponse(BaseModel):
     content: str = Field(..., description="메시지 내용")
     type: str = Field(default="text", description="응답 타입 (text/map)")
     link: Optional[str] = Field(None, description="카카오맵 링크 (지도 응답 시)")
-    data: Optional[Dict[str, Any]] = Field(None, description="지도 데이터 (지도 응답 시)")
+    data: Optional[MapData] = Field(None, description="지도 데이터 (지도 응답 시)")
     conversation_id: str = Field(..., description="대화 ID")
 
+
+# ============================================================
+# Agent 쿼리 분석 결과 (slots → dict 해싱 없이 속성 접근)
+# ============================================================
+
+@dataclass(slots=True, frozen=True)
+class QueryAnalysis:
+    """쿼리 분석 결과 (services.agent_service.analyze_user_query 반환 형식)"""
+    type: str                         # "emotion", "need_location", "ready", "show_map"
+    location: Optional[str] = None    # 대표 도시명 (예: "서울")
+    date: Optional[str] = None        # "today", "weekend", "2024-01-01" 등
+    has_emotion: bool = False
+
+
 # ============================================================
 # LangGraph용 TypedDict 스키마
 # ============================================================
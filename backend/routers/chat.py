@@ -4,22 +4,180 @@
 Chat Router - LangChain Agent 통합
 """
 
-import uuid
-from fastapi import APIRouter
+import asyncio
+import secrets
+from typing import Any, Dict, List, Optional
 
-from models.chat_schema import ChatRequest, ChatResponse
-from services.agent_service import run_agent
+import orjson
+from fastapi import APIRouter, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+
+from models.chat_schema import ChatRequest, ChatResponse, MapData, MapMarker, Center
 from utils.session_manager import (
-    get_history,
-    save_history
+    aget_history,
+    asave_history,
+    clear_history,
+    get_session_count as count_sessions
 )
+from utils.config import get_settings
 from utils.logger import logger
+from utils.lazy import lazy_import
+from utils.semantic_cache import get_semantic_cache
+
+# LangChain / 모델 의존성은 첫 /chat/message 호출 시 로드
+run_agent = lazy_import("services.agent_service.run_agent")
+analyze_user_query = lazy_import("services.agent_service.analyze_user_query")
 
 router = APIRouter(
     prefix="/chat",
     tags=["Chat"]
 )
 
+# 응답 직렬화기 (pydantic-core에서 바로 JSON 생성 → jsonable_encoder 우회)
+_CHAT_RESP_ADAPTER = TypeAdapter(ChatResponse)
+
+
+# 에러 응답 문구
+_ERROR_MESSAGE = "죄송합니다. 일시적인 오류가 발생했습니다. 다시 시도해주세요."
+
+# 스트리밍 종료 표시
+_STREAM_DONE = object()
+
+
+def _new_conversation_id() -> str:
+    """새 대화 ID 생성 (128bit 랜덤 hex)"""
+    return secrets.token_hex(16)
+
+
+def _build_map_data(map_data: Optional[Dict[str, Any]]) -> Optional[MapData]:
+    """Agent가 만든 지도 데이터를 검증 없이 MapData로 변환 (신뢰된 내부 데이터)"""
+    if not map_data:
+        return None
+    return MapData.model_construct(
+        center=Center.model_construct(**map_data["center"]),
+        markers=[MapMarker.model_construct(**m) for m in map_data["markers"]]
+    )
+
+
+def _build_chat_response(result: Dict[str, Any], conversation_id: str) -> ChatResponse:
+    """
+    Agent 결과를 응답 타입(map/text)에 맞게 ChatResponse로 변환
+    
+    Agent 출력은 서버 내부에서 생성된 값이므로 model_construct로 재검증 생략
+    """
+    if result["response_type"] == "map":
+        # 지도 응답
+        return ChatResponse.model_construct(
+            role="ai",
+            content=result["answer"],
+            type="map",
+            link=result.get("map_link"),
+            data=_build_map_data(result.get("map_data")),
+            conversation_id=conversation_id
+        )
+    
+    # 텍스트 응답
+    return ChatResponse.model_construct(
+        role="ai",
+        content=result["answer"],
+        type="text",
+        link=None,
+        data=None,
+        conversation_id=conversation_id
+    )
+
+
+async def _run_agent_cached(
+    message: str,
+    conversation_id: str,
+    conversation_history: List[Dict[str, str]]
+) -> Dict[str, Any]:
+    """
+    Semantic Cache를 거쳐 Agent 실행
+    
+    히스토리에 의존하지 않는 첫 턴 질문만 캐시 조회/저장
+    (감정 표현·위치 되묻기 등 고정 응답은 임베딩 없이 바로 Agent 실행)
+    """
+    cacheable = get_settings().SEMANTIC_CACHE_ENABLED and not conversation_history
+    cache_tag = None
+    if cacheable:
+        analysis = analyze_user_query(message, [])
+        if analysis.type == "ready":
+            # 답변에 도시·날짜별 날씨/시설이 들어가므로 위치·날짜가 같은 질문끼리만 재사용
+            cache_tag = (analysis.location, analysis.date)
+        else:
+            cacheable = False
+    cache = get_semantic_cache()
+    
+    if cacheable:
+        try:
+            cached = await asyncio.to_thread(cache.get, message, cache_tag)
+        except Exception as e:
+            logger.warning(f"⚠️ 캐시 조회 실패: {e}")
+            cached = None
+        
+        if cached:
+            result = dict(cached)
+            result["conversation_history"] = list(result.pop("history_tail"))
+            return result
+    
+    # 동기 Agent(LLM + 도구 호출)는 워커 스레드에서 실행 → 이벤트 루프 블로킹 방지
+    result = await asyncio.to_thread(
+        run_agent,
+        user_query=message,
+        conversation_id=conversation_id,
+        conversation_history=conversation_history
+    )
+    
+    # 날씨 오류/Mock, Mock RAG, Mock 답변으로 만든 결과는 캐시하지 않음 (run_agent가 판단)
+    if cacheable and result.get("cacheable"):
+        payload = {k: v for k, v in result.items() if k != "conversation_history"}
+        payload["history_tail"] = result["conversation_history"]
+        try:
+            await asyncio.to_thread(cache.set, message, payload, cache_tag)
+        except Exception as e:
+            logger.warning(f"⚠️ 캐시 저장 실패: {e}")
+    
+    return result
+
+
+def _sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Server-Sent Events 포맷 문자열 생성"""
+    payload = orjson.dumps(data).decode("utf-8")
+    if event:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f"data: {payload}\n\n"
+
+
+def _json_response(resp: ChatResponse) -> Response:
+    """ChatResponse를 JSON Response로 변환"""
+    return Response(
+        content=_CHAT_RESP_ADAPTER.dump_json(resp),
+        media_type="application/json"
+    )
+
+
+# 에러 응답 JSON 템플릿 (conversation_id 자리만 치환)
+_ERROR_ID_PLACEHOLDER = b'"__CONVERSATION_ID__"'
+_ERROR_JSON_TEMPLATE = _CHAT_RESP_ADAPTER.dump_json(ChatResponse.model_construct(
+    role="ai",
+    content=_ERROR_MESSAGE,
+    type="text",
+    link=None,
+    data=None,
+    conversation_id="__CONVERSATION_ID__"
+))
+
+
+def _error_response(conversation_id: str) -> Response:
+    """미리 직렬화한 템플릿으로 에러 응답 생성"""
+    return Response(
+        content=_ERROR_JSON_TEMPLATE.replace(_ERROR_ID_PLACEHOLDER, orjson.dumps(conversation_id)),
+        media_type="application/json",
+        status_code=200
+    )
+
 
 @router.post(
     "/message",
@@ -27,7 +185,7 @@ router = APIRouter(
     summary="챗봇 메시지 처리 (LangChain Agent)",
     description="LangChain Agent로 자동 도구 선택 및 실행"
 )
-async def chat_message(request: ChatRequest) -> ChatResponse:
+async def chat_message(request: ChatRequest) -> Response:
     """
     메인 챗봇 엔드포인트
     
@@ -37,68 +195,101 @@ async def chat_message(request: ChatRequest) -> ChatResponse:
     4. 히스토리 저장
     5. 응답 반환
     """
+    # 1. conversation_id 처리 (에러 응답에서도 같은 ID 사용)
+    conversation_id = request.conversation_id or _new_conversation_id()
+    
     try:
-        # 1. conversation_id 처리
-        conversation_id = request.conversation_id
-        if not conversation_id:
-            conversation_id = str(uuid.uuid4())
-            logger.info(f"🆕 새 대화 생성: {conversation_id}")
-        else:
+        if request.conversation_id:
             logger.info(f"📖 기존 대화 계속: {conversation_id}")
+        else:
+            logger.info(f"🆕 새 대화 생성: {conversation_id}")
         
         # 2. 히스토리 로드
-        conversation_history = get_history(conversation_id)
+        conversation_history = await aget_history(conversation_id)
         
         # 3. Agent 실행
         logger.info(f"💬 사용자 메시지: '{request.message}'")
         
-        result = run_agent(
-            user_query=request.message,
-            conversation_id=conversation_id,
-            conversation_history=conversation_history
+        result = await _run_agent_cached(
+            request.message,
+            conversation_id,
+            conversation_history
         )
         
         # 4. 히스토리 저장
-        save_history(conversation_id, result["conversation_history"])
+        await asave_history(conversation_id, result["conversation_history"])
         
         logger.info(f"✅ 응답 생성 완료 (타입: {result['response_type']})")
         
         # 5. 응답 타입에 따라 반환
-        if result["response_type"] == "map":
-            # 지도 응답
-            return ChatResponse(
-                role="ai",
-                content=result["answer"],
-                type="map",
-                link=result.get("map_link"),
-                data=result.get("map_data"),
-                conversation_id=conversation_id
-            )
-        else:
-            # 텍스트 응답
-            return ChatResponse(
-                role="ai",
-                content=result["answer"],
-                type="text",
-                link=None,
-                data=None,
-                conversation_id=conversation_id
-            )
+        resp = _build_chat_response(result, conversation_id)
+        
+        return _json_response(resp)
     
     except Exception as e:
         logger.error(f"❌ 챗봇 처리 중 오류: {e}", exc_info=True)
         
         # 에러 시에도 conversation_id 반환
-        error_conversation_id = request.conversation_id or str(uuid.uuid4())
+        return _error_response(conversation_id)
+
+
+@router.post(
+    "/message/stream",
+    summary="챗봇 메시지 처리 (SSE 스트리밍)",
+    description="답변을 생성되는 대로 Server-Sent Events로 전송"
+)
+async def chat_message_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    스트리밍 챗봇 엔드포인트
+    
+    - `data: {"token": "..."}` 이벤트로 답변 조각 전송
+    - 마지막에 `event: done`으로 전체 응답(ChatResponse + tools_used) 전송
+    - 오류 시 `event: error` 전송
+    """
+    conversation_id = request.conversation_id or _new_conversation_id()
+    conversation_history = await aget_history(conversation_id)
+    
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    def on_token(token: str) -> None:
+        # Agent 워커 스레드 → 이벤트 루프로 토큰 전달
+        loop.call_soon_threadsafe(queue.put_nowait, token)
+    
+    async def event_stream():
+        logger.info(f"💬 사용자 메시지 (stream): '{request.message}'")
         
-        return ChatResponse(
-            role="ai",
-            content="죄송합니다. 일시적인 오류가 발생했습니다. 다시 시도해주세요.",
-            type="text",
-            link=None,
-            data=None,
-            conversation_id=error_conversation_id
-        )
+        task = asyncio.ensure_future(asyncio.to_thread(
+            run_agent,
+            user_query=request.message,
+            conversation_id=conversation_id,
+            conversation_history=conversation_history,
+            on_token=on_token
+        ))
+        task.add_done_callback(lambda _: queue.put_nowait(_STREAM_DONE))
+        
+        while (token := await queue.get()) is not _STREAM_DONE:
+            yield _sse({"token": token})
+        
+        try:
+            result = task.result()
+            await asave_history(conversation_id, result["conversation_history"])
+            
+            resp = _build_chat_response(result, conversation_id)
+            done = resp.model_dump(mode="json")
+            done["tools_used"] = result["tools_used"]
+            
+            logger.info(f"✅ 스트리밍 응답 완료 (타입: {result['response_type']})")
+            yield _sse(done, event="done")
+        
+        except Exception as e:
+            logger.error(f"❌ 스트리밍 처리 중 오류: {e}", exc_info=True)
+            yield _sse(
+                {"content": _ERROR_MESSAGE, "conversation_id": conversation_id},
+                event="error"
+            )
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
 @router.delete(
@@ -107,8 +298,6 @@ async def chat_message(request: ChatRequest) -> ChatResponse:
 )
 async def clear_conversation(conversation_id: str):
     """대화 히스토리 삭제"""
-    from utils.session_manager import clear_history
-    
     clear_history(conversation_id)
     
     return {
@@ -123,9 +312,7 @@ async def clear_conversation(conversation_id: str):
 )
 async def get_session_count():
     """활성 세션 개수 조회"""
-    from utils.session_manager import get_session_count
-    
-    count = get_session_count()
+    count = count_sessions()
     
     return {
         "active_sessions": count
@@ -3,19 +3,26 @@
 RAG Router - 시설 검색 API
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Dict, Any, Optional
 
 from services.rag_service import get_rag_service
 from utils.logger import logger
+from utils.vector_client import get_vector_client
 
 router = APIRouter(
     prefix="/rag",
-    tags=["RAG"]
+    tags=["RAG"],
+    default_response_class=ORJSONResponse
 )
 
 
+# 메타데이터 필터로 사용하는 요청 필드
+_FILTER_FIELDS = ("region_city", "category1", "in_out")
+
+
 class RAGSearchRequest(BaseModel):
     """RAG 검색 요청 모델"""
     query: str = Field(..., description="검색 키워드", example="서울 실내 놀이터")
@@ -24,6 +31,11 @@ class RAGSearchRequest(BaseModel):
     category1: Optional[str] = Field(None, description="대분류 필터", example="놀이")
     in_out: Optional[str] = Field(None, description="실내/실외 필터", example="실내")
 
+    def active_filters(self) -> Optional[Dict[str, str]]:
+        """값이 지정된 필터만 모아 반환 (없으면 None)"""
+        filters = {name: value for name in _FILTER_FIELDS if (value := getattr(self, name))}
+        return filters or None
+
 
 class RAGSearchResponse(BaseModel):
     """RAG 검색 응답 모델"""
@@ -33,13 +45,17 @@ class RAGSearchResponse(BaseModel):
     total_found: int
 
 
+# 응답 직렬화기 (pydantic-core에서 바로 JSON 생성)
+_RAG_RESP_ADAPTER = TypeAdapter(RAGSearchResponse)
+
+
 @router.post(
     "/search",
     response_model=RAGSearchResponse,
     summary="RAG 기반 시설 검색",
     description="크로스 인코더 리랭킹 · MMR 다양성 필터링 지원"
 )
-async def rag_search(request: RAGSearchRequest) -> RAGSearchResponse:
+async def rag_search(request: RAGSearchRequest) -> Response:
     """
     RAG 검색 엔드포인트
 
@@ -50,28 +66,23 @@ async def rag_search(request: RAGSearchRequest) -> RAGSearchResponse:
     try:
         logger.info(f"🔍 RAG 요청: '{request.query}'")
 
-        # 필터 조립
-        filters: Dict[str, str] = {}
-        if request.region_city:
-            filters["region_city"] = request.region_city
-        if request.category1:
-            filters["category1"] = request.category1
-        if request.in_out:
-            filters["in_out"] = request.in_out
-
         rag_service = get_rag_service()
         results = rag_service.search_and_rerank(
             query=request.query,
             top_k=request.top_k,
-            filters=filters or None
+            filters=request.active_filters()
         )
 
-        return RAGSearchResponse(
+        resp = RAGSearchResponse(
             success=True,
             query=request.query,
             results=results,
             total_found=len(results)
         )
+        return Response(
+            content=_RAG_RESP_ADAPTER.dump_json(resp, exclude_none=True),
+            media_type="application/json"
+        )
 
     except Exception as e:
         logger.error(f"RAG API 오류: {e}")
@@ -86,7 +97,6 @@ async def rag_search(request: RAGSearchRequest) -> RAGSearchResponse:
 )
 async def rag_health():
     try:
-        from utils.vector_client import get_vector_client
         client = get_vector_client()
         info = client.get_collection_info()
 
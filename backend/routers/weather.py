@@ -3,14 +3,18 @@
 Weather Router - 기상청 API 연동
 """
 
+import asyncio
+
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import ORJSONResponse
 from typing import Optional
 from services.weather_service import get_weather
 from utils.logger import logger
 
 router = APIRouter(
     prefix="/weather",
-    tags=["Weather"]
+    tags=["Weather"],
+    default_response_class=ORJSONResponse
 )
 
 
@@ -28,7 +32,8 @@ async def get_current_weather(
     """
     try:
         logger.info(f"🌦️ 날씨 조회 요청: {location}, date={date}")
-        result = get_weather(location=location, target_date=date)
+        # 외부 API 호출은 워커 스레드에서 실행 → 이벤트 루프 블로킹 방지
+        result = await asyncio.to_thread(get_weather, location=location, target_date=date)
         return {
             "success": True,
             "location": location,
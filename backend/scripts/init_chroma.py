@@ -8,7 +8,9 @@ CSV 파일을 읽어 ChromaDB에 벡터 데이터를 로드합니다.
 import sys
 import os
 import pandas as pd
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 # backend 디렉토리를 Python 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -17,58 +19,158 @@ from utils.vector_client import get_vector_client
 from utils.logger import logger
 
 
-def load_csv_to_chroma(csv_path: str, batch_size: int = 100):
+# Chroma 메타데이터로 저장할 컬럼 (검색 필터 · 답변 생성 · 지도 마커에서 읽는 키만)
+# - 필터: ctprvn_nm, signgu_nm, region_city, region_gu, category1, in_out
+# - 답변/지도: facility_name, price, target_age, lat/lon 계열 좌표
+# 나머지 컬럼은 description 본문에 이미 포함되어 있으므로 저장하지 않습니다.
+META_COLS = [
+    "facility_name",
+    "ctprvn_nm", "signgu_nm", "region_city", "region_gu",
+    "category1", "category2", "category3", "in_out",
+    "price", "target_age",
+    "lat", "lon", "lng", "latitude", "longitude",
+]
+
+
+def build_metadatas(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    DataFrame → Chroma 메타데이터 리스트 (컬럼 단위 변환)
+    
+    to_dict("records")처럼 셀마다 박싱하지 않고, 컬럼별로 한 번씩
+    파이썬 리스트로 변환한 뒤 행 단위로 묶습니다.
+    META_COLS에 없는 컬럼과 값이 전부 비어있는 컬럼은 제외합니다.
+    """
+    columns = [col for col in META_COLS if col in df.columns and df[col].notna().any()]
+    values = [df[col].tolist() for col in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def load_csv_to_chroma(csv_path: str, batch_size: int = 5000, parallel_writers: int = 1):
     """
     CSV 파일을 ChromaDB에 로드
     
+    CSV를 batch_size 행씩 스트리밍으로 읽어, 청크마다 한 번의 모델 호출로
+    임베딩한 뒤 미리 계산한 임베딩과 함께 업로드합니다.
+    (메모리 사용량은 파일 크기가 아닌 배치 크기에 비례)
+    
+    parallel_writers > 1이면 ChromaDB add를 스레드 풀에서 실행해
+    다음 청크의 임베딩과 이전 청크의 쓰기 I/O를 겹칩니다.
+    (동시에 대기 중인 배치는 parallel_writers * 2개로 제한)
+    
     Args:
         csv_path: CSV 파일 경로
-        batch_size: 배치 크기 (메모리 효율성)
+        batch_size: 배치 크기 (CSV 청크 및 ChromaDB add 1회당 문서 수)
+        parallel_writers: 동시 업로드 스레드 수 (1이면 순차 업로드)
     """
     try:
-        # CSV 로드
-        logger.info(f"📂 CSV 파일 로딩: {csv_path}")
-        df = pd.read_csv(csv_path)
-        logger.info(f"✅ {len(df)}개 행 로드 완료")
+        # VectorClient 초기화
+        logger.info("🔗 ChromaDB 연결 중...")
+        client = get_vector_client()
         
-        # 필수 컬럼 확인
-        required_cols = ["facility_name", "description"]
-        missing_cols = [col for col in required_cols if col not in df.columns]
+        # ChromaDB 최대 배치 크기 제한
+        max_batch_size = client.get_max_batch_size()
+        if max_batch_size and batch_size > max_batch_size:
+            logger.info(f"⚠️ 배치 크기 조정: {batch_size} → {max_batch_size} (ChromaDB 제한)")
+            batch_size = max_batch_size
         
-        if missing_cols:
-            raise ValueError(f"필수 컬럼 누락: {missing_cols}")
+        # CSV 스트리밍 로드
+        logger.info(f"📂 CSV 파일 로딩: {csv_path} (청크 크기: {batch_size}, 업로드 스레드: {parallel_writers})")
+        reader = pd.read_csv(csv_path, chunksize=batch_size)
         
-        # NaN 제거
-        df = df.dropna(subset=required_cols)
-        logger.info(f"🧹 정제 후: {len(df)}개 행")
+        required_cols = ["facility_name", "description"]
+        total_rows = 0
+        total_docs = 0
+        failed_ids: List[str] = []
         
-        # VectorClient 초기화
-        logger.info("🔗 ChromaDB 연결 중...")
-        client = get_vector_client()
+        def record(batch_num: int, ids: List[str], error: Optional[BaseException]) -> None:
+            """배치 업로드 결과 집계 (실패 시 ID만 모아두고 배치당 한 번만 기록)"""
+            nonlocal total_docs
+            if error is not None:
+                failed_ids.extend(ids)
+                logger.warning(f"⚠️ 배치 {batch_num} 업로드 실패 ({len(ids)}개 문서): {error}")
+                return
+            total_docs += len(ids)
+            logger.info(f"✅ 배치 {batch_num} 완료 (누적 {total_docs}개 문서)")
         
-        # 배치 처리
-        total_batches = (len(df) + batch_size - 1) // batch_size
-        logger.info(f"📦 {total_batches}개 배치로 나누어 업로드")
+        def drain(futures: Iterable[Future]) -> None:
+            for future in futures:
+                batch_num, ids = pending.pop(future)
+                record(batch_num, ids, future.exception())
         
-        for i in range(0, len(df), batch_size):
-            batch_df = df.iloc[i:i+batch_size]
-            batch_num = (i // batch_size) + 1
-            
-            logger.info(f"⏳ 배치 {batch_num}/{total_batches} 처리 중...")
-            
-            # 문서 및 메타데이터 준비
-            documents = batch_df["description"].tolist()
-            metadatas = batch_df.to_dict("records")
-            ids = [f"facility_{idx}" for idx in batch_df.index]
-            
-            # ChromaDB에 추가
-            client.add_documents(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
+        executor = None
+        if parallel_writers > 1:
+            executor = ThreadPoolExecutor(max_workers=parallel_writers, thread_name_prefix="chroma-writer")
+        max_in_flight = parallel_writers * 2
+        pending: Dict[Future, Tuple[int, List[str]]] = {}
+        
+        try:
+            for batch_num, batch_df in enumerate(reader, 1):
+                # 필수 컬럼 확인 (첫 청크)
+                if batch_num == 1:
+                    missing_cols = [col for col in required_cols if col not in batch_df.columns]
+                    if missing_cols:
+                        raise ValueError(f"필수 컬럼 누락: {missing_cols}")
+                
+                total_rows += len(batch_df)
+                
+                # NaN 제거
+                batch_df = batch_df.dropna(subset=required_cols)
+                if batch_df.empty:
+                    continue
+                
+                logger.info(f"⏳ 배치 {batch_num} 처리 중... ({len(batch_df)}개 문서)")
+                
+                # 문서 및 메타데이터 준비
+                documents = batch_df["description"].tolist()
+                metadatas = build_metadatas(batch_df)
+                ids = ("facility_" + batch_df.index.astype(str)).tolist()
+                
+                try:
+                    # 청크 단위 임베딩 (한 번의 모델 호출)
+                    embeddings = client.encode_documents(documents).tolist()
+                except Exception as e:
+                    record(batch_num, ids, e)
+                    continue
+                
+                # ChromaDB에 추가 (미리 계산한 임베딩 사용)
+                if executor is None:
+                    try:
+                        client.add_documents(
+                            documents=documents,
+                            metadatas=metadatas,
+                            ids=ids,
+                            embeddings=embeddings
+                        )
+                    except Exception as e:
+                        record(batch_num, ids, e)
+                    else:
+                        record(batch_num, ids, None)
+                    continue
+                
+                # 대기 중인 배치가 많으면 하나 이상 끝날 때까지 대기 (메모리 상한)
+                if len(pending) >= max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    drain(done)
+                
+                future = executor.submit(
+                    client.add_documents,
+                    documents=documents,
+                    metadatas=metadatas,
+                    ids=ids,
+                    embeddings=embeddings
+                )
+                pending[future] = (batch_num, ids)
             
-            logger.info(f"✅ 배치 {batch_num} 완료 ({len(documents)}개 문서)")
+            drain(as_completed(list(pending)))
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        
+        logger.info(f"🧹 {total_rows}개 행 중 {total_docs}개 업로드 (필수값 누락 {total_rows - total_docs - len(failed_ids)}개 제외)")
+        
+        if failed_ids:
+            logger.error(f"❌ 업로드 실패 문서 {len(failed_ids)}개 (예: {failed_ids[:5]})")
+            return False
         
         # 최종 확인
         info = client.get_collection_info()
@@ -82,10 +184,8 @@ def load_csv_to_chroma(csv_path: str, batch_size: int = 100):
         logger.error(f"❌ 파일을 찾을 수 없습니다: {csv_path}")
         return False
     
-    except Exception as e:
-        logger.error(f"❌ 데이터 로드 실패: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("❌ 데이터 로드 실패")
         return False
 
 
@@ -134,8 +234,14 @@ def main():
     parser.add_argument(
         "--batch-size",
         type=int,
-        default=100,
-        help="배치 크기 (기본값: 100)"
+        default=5000,
+        help="배치 크기 (기본값: 5000, CSV 청크 단위이며 ChromaDB 최대 배치 크기로 자동 제한)"
+    )
+    parser.add_argument(
+        "--parallel-writers",
+        type=int,
+        default=1,
+        help="ChromaDB 동시 업로드 스레드 수 (기본값: 1, 순차 업로드)"
     )
     parser.add_argument(
         "--verify",
@@ -146,7 +252,7 @@ def main():
     args = parser.parse_args()
     
     # 데이터 로드
-    success = load_csv_to_chroma(args.csv_path, args.batch_size)
+    success = load_csv_to_chroma(args.csv_path, args.batch_size, max(1, args.parallel_writers))
     
     if not success:
         sys.exit(1)
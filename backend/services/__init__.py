@@ -7,5 +7,6 @@ __all__ = [
     "get_llm_service",
     "get_rag_service",
     "get_map_markers",
+    "get_map_markers_from_list",
     "get_weather",
 ]
\ No newline at end of file
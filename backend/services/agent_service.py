@@ -8,18 +8,74 @@ LangChain Agent Service (Simplified 3-Step Logic)
 4. 지도 요청 → 히스토리에서 RAG 결과 추출 후 지도 생성
 """
 
-import json
+import copy
+import hashlib
 import re
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Callable, FrozenSet
 
+import orjson
 from langchain_core.tools import tool
 
 from services.llm_service import get_llm_service
 from services.rag_service import get_rag_service
 from services.weather_service import get_weather
-from services.map_service import get_map_markers
+from services.map_service import get_map_markers, get_map_markers_from_list
+from models.chat_schema import QueryAnalysis
 from data.location import KMA_LOCATION_CODES, DONG_TO_CITY, LANDMARK_TO_CITY, UNIVERSITY_TO_CITY, LOCATION_MAP
+from utils.config import get_settings
+from utils.lazy import lazy_import
 from utils.logger import logger
+from utils.session_manager import get_cached_location, save_cached_location
+from utils.ttl_cache import TTLCache
+
+# GPU 전용 라이브러리 (LLM 생성 경로에서 처음 사용할 때 import, Mock 환경에서는 import 안 함)
+torch = lazy_import("torch")
+GenerationConfig = lazy_import("transformers.GenerationConfig")
+TextIteratorStreamer = lazy_import("transformers.TextIteratorStreamer")
+
+# 다중 키워드 매칭용 Aho-Corasick (미설치 시 순차 부분문자열 검사로 동작)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _dumps(obj: Any) -> str:
+    """도구 반환용 JSON 직렬화 (orjson, 한글 이스케이프 없음)"""
+    return orjson.dumps(obj).decode("utf-8")
+
+
+# 날씨/RAG 등 I/O 위주 도구를 동시에 실행하기 위한 스레드 풀
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="agent-tool")
+
+# (질문, 지역, 날짜) 정확 매칭 답변 캐시 → 적중 시 날씨 API · RAG · LLM 생략
+_settings = get_settings()
+_AGENT_CACHE = TTLCache(max_size=_settings.AGENT_CACHE_SIZE, ttl=_settings.AGENT_CACHE_TTL)
+
+
+def _build_location_filters(location: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    위치 문자열 → ChromaDB 메타데이터 필터
+    
+    "서울 강남" → 시도 + 시군구, "서울" → 시도, 없으면 None
+    """
+    if not location:
+        return None
+    parts = location.split()
+    if len(parts) >= 2:
+        return {
+            "$and": [
+                {"ctprvn_nm": {"$eq": parts[0]}},
+                {"signgu_nm": {"$eq": parts[1]}}
+            ]
+        }
+    if len(parts) == 1:
+        return {"ctprvn_nm": {"$eq": parts[0]}}
+    return None
 
 
 # ============================================================
@@ -32,10 +88,10 @@ def weather_tool(location: str) -> str:
     try:
         logger.info(f"[WeatherTool] 호출: {location}")
         result = get_weather(location=location, target_date=None)
-        return json.dumps(result, ensure_ascii=False)
+        return _dumps(result)
     except Exception as e:
         logger.error(f"[WeatherTool] 오류: {e}")
-        return json.dumps({"error": str(e)})
+        return _dumps({"error": str(e)})
 
 
 @tool
@@ -45,24 +101,10 @@ def rag_search_tool(query: str, location: Optional[str] = None) -> str:
         logger.info(f"[RAGTool] 호출: query='{query}', location='{location}'")
         rag_service = get_rag_service()
         
-        # 필터 구성
-        filters = None
-        if location:
-            parts = location.split()
-            if len(parts) >= 2:
-                filters = {
-                    "$and": [
-                        {"ctprvn_nm": {"$eq": parts[0]}},
-                        {"signgu_nm": {"$eq": parts[1]}}
-                    ]
-                }
-            elif len(parts) == 1:
-                filters = {"ctprvn_nm": {"$eq": parts[0]}}
-        
         results = rag_service.search_and_rerank(
             query=query,
             top_k=5,
-            filters=filters
+            filters=_build_location_filters(location)
         )
         
         formatted = []
@@ -76,10 +118,10 @@ def rag_search_tool(query: str, location: Optional[str] = None) -> str:
                 "in_out": metadata.get("in_out", ""),
                 "target_age": metadata.get("target_age", "")
             })
-        return json.dumps(formatted, ensure_ascii=False)
+        return _dumps(formatted)
     except Exception as e:
         logger.error(f"[RAGTool] 오류: {e}")
-        return json.dumps({"error": str(e)})
+        return _dumps({"error": str(e)})
 
 
 @tool
@@ -92,10 +134,10 @@ def map_tool(markers_json: str) -> str:
     try:
         logger.info(f"[MapTool] 호출")
         result = get_map_markers(markers_json)
-        return json.dumps(result, ensure_ascii=False)
+        return _dumps(result)
     except Exception as e:
         logger.error(f"[MapTool] 오류: {e}")
-        return json.dumps({"error": str(e)})
+        return _dumps({"error": str(e)})
 
 
 def get_tools():
@@ -107,155 +149,277 @@ def get_tools():
 # 1단계: 쿼리 분석 (감정/위치 감지)
 # ============================================================
 
-def analyze_user_query(query: str, conversation_history: List[Dict[str, str]]) -> Dict[str, Any]:
+# 고정 응답 (요청마다 새로 만들지 않음)
+_NEED_LOCATION_ANSWER = "어느 지역을 생각하고 계신가요? 🗺️\n(예: 서울 강남, 부산 해운대)"
+_EMOTION_RESPONSES = {
+    "고마": "천만에요! 😊 더 궁금한 점이 있으시면 언제든 말씀해주세요!",
+    "감사": "도움이 되었다니 기쁩니다! 🎉 또 필요하신 게 있으시면 말씀해주세요!",
+    "좋아": "마음에 드셨다니 정말 기쁩니다! 😄 즐거운 시간 보내세요!",
+    "최고": "감사합니다! 😊 항상 최선을 다하겠습니다!",
+    "완벽": "완벽하다는 말씀 감사합니다! ✨ 즐거운 시간 되세요!"
+}
+_EMOTION_DEFAULT_RESPONSE = "말씀해주셔서 감사합니다! 😊 더 도와드릴 것이 있을까요?"
+
+
+# 지도 요청 / 감정 표현 / 추천 요청 키워드
+_MAP_KEYWORDS = ("지도", "맵", "map", "위치", "보여줘", "보여주세요", "표시")
+_EMOTION_KEYWORDS = (
+    "고마워", "감사", "좋아", "최고", "완벽", "훌륭",
+    "thank", "thanks", "great", "awesome", "perfect"
+)
+_REQUEST_KEYWORDS = ("추천", "찾아", "어디", "뭐해", "갈만한")
+_KEYWORD_CATEGORIES = (
+    ("map", _MAP_KEYWORDS),
+    ("emotion", _EMOTION_KEYWORDS),
+    ("request", _REQUEST_KEYWORDS),
+)
+
+
+def _build_keyword_automaton():
+    """
+    모든 키워드 → 하나의 Aho-Corasick 오토마톤
+    
+    payload는 키워드의 태그 집합: 카테고리("map"/"emotion"/"request")와
+    감정 응답 선택용 "reply:<키워드>"
+    """
+    tags: Dict[str, set] = {}
+    for category, words in _KEYWORD_CATEGORIES:
+        for word in words:
+            tags.setdefault(word, set()).add(category)
+    for word in _EMOTION_RESPONSES:
+        tags.setdefault(word, set()).add("reply:" + word)
+    
+    automaton = ahocorasick.Automaton()
+    for word, word_tags in tags.items():
+        automaton.add_word(word, frozenset(word_tags))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AC = _build_keyword_automaton() if ahocorasick is not None else None
+
+# pyahocorasick 미설치 시 카테고리별 regex 사용 (대소문자 무시)
+_CATEGORY_RES = tuple(
+    (category, re.compile("|".join(words), re.IGNORECASE))
+    for category, words in _KEYWORD_CATEGORIES
+)
+
+
+@lru_cache(maxsize=1024)
+def _keyword_tags(query: str) -> FrozenSet[str]:
+    """쿼리에 포함된 키워드 태그를 한 번의 스캔으로 수집 (분석·감정 응답에서 공유)"""
+    if _KEYWORD_AC is not None:
+        found = set()
+        for _, word_tags in _KEYWORD_AC.iter(query.lower()):
+            found |= word_tags
+        return frozenset(found)
+    
+    found = {category for category, pattern in _CATEGORY_RES if pattern.search(query)}
+    found.update("reply:" + word for word in _EMOTION_RESPONSES if word in query)
+    return frozenset(found)
+
+
+# 고정 분석 결과 (불변 객체이므로 매 턴 새로 만들지 않고 공유)
+_SHOW_MAP_ANALYSIS = QueryAnalysis(type="show_map")
+_EMOTION_ANALYSIS = QueryAnalysis(type="emotion", has_emotion=True)
+
+
+def analyze_user_query(
+    query: str,
+    conversation_history: List[Dict[str, str]],
+    last_location: Optional[str] = None
+) -> QueryAnalysis:
     """
     사용자 쿼리를 4가지 타입으로 분류
     
+    Args:
+        last_location: 이전 턴에서 인식된 위치 (있으면 히스토리 재스캔 대신 사용)
+    
     Returns:
-        {
-            "type": "emotion" | "need_location" | "ready" | "show_map",
-            "location": str or None,
-            "date": str or None,
-            "has_emotion": bool
-        }
+        QueryAnalysis(type="emotion" | "need_location" | "ready" | "show_map", location, date, has_emotion)
     """
-    query_lower = query.lower()
+    tags = _keyword_tags(query)
     
     # 0단계: 지도 요청 감지
-    map_keywords = ["지도", "맵", "map", "위치", "보여줘", "보여주세요", "표시"]
-    if any(keyword in query_lower for keyword in map_keywords):
+    if "map" in tags and conversation_history:
         if has_rag_results_in_history(conversation_history):
-            return {"type": "show_map", "location": None, "date": None, "has_emotion": False}
+            return _SHOW_MAP_ANALYSIS
     
-    # 1단계: 감정 표현 감지
-    emotion_keywords = [
-        "고마워", "감사", "좋아", "최고", "완벽", "훌륭",
-        "thank", "thanks", "great", "awesome", "perfect"
-    ]
-    has_emotion = any(keyword in query_lower for keyword in emotion_keywords)
+    # 1단계: 감정 표현 감지 (추천 요청이 없으면 위치/날짜 추출 없이 바로 응답)
+    if "emotion" in tags and "request" not in tags:
+        return _EMOTION_ANALYSIS
     
     # 2단계: 위치 정보 추출
     location = extract_location(query)
     
-    # 이전 대화에서 위치 찾기
+    # 이전 대화에서 위치 찾기 (히스토리가 없으면 스캔 생략)
     if not location:
-        location = extract_location_from_history(conversation_history)
+        location = last_location
+        if not location and conversation_history:
+            location = extract_location_from_history(conversation_history)
     
     # 3단계: 날짜 정보 추출
     date_info = extract_date(query)
     
     # 쿼리 타입 결정
-    if has_emotion and not any(k in query_lower for k in ["추천", "찾아", "어디", "뭐해", "갈만한"]):
-        return {"type": "emotion", "location": None, "date": None, "has_emotion": True}
-    
     if not location:
-        return {"type": "need_location", "location": None, "date": date_info, "has_emotion": False}
+        return QueryAnalysis(type="need_location", date=date_info)
     
-    return {"type": "ready", "location": location, "date": date_info, "has_emotion": False}
+    return QueryAnalysis(type="ready", location=location, date=date_info)
+
+
+def _load_rag_results(msg: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
+    """system 메시지에 저장된 RAG 결과 파싱 (RAG 메시지가 아니면 None)"""
+    if msg.get("role") != "system":
+        return None
+    raw = msg.get("content")
+    # RAG 메타데이터가 아닌 메시지는 파싱 없이 건너뜀
+    if not isinstance(raw, str) or '"rag_results"' not in raw:
+        return None
+    return _parse_rag_results(raw)
+
+
+@lru_cache(maxsize=256)
+def _parse_rag_results(raw: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    RAG system 메시지 본문 파싱 (본문 문자열 기준 캐시)
+    
+    같은 system 메시지가 매 턴 히스토리에 남아 있으므로 한 번만 파싱합니다.
+    반환 리스트는 공유되므로 호출자는 수정하지 않아야 합니다.
+    """
+    try:
+        content = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    if isinstance(content, dict) and "rag_results" in content:
+        return content["rag_results"]
+    return None
 
 
 def has_rag_results_in_history(history: List[Dict[str, str]]) -> bool:
     """히스토리에 RAG 결과가 있는지 확인"""
-    for msg in reversed(history[-10:]):
-        if msg.get("role") == "system":
-            try:
-                content = json.loads(msg["content"])
-                if "rag_results" in content and content["rag_results"]:
-                    return True
-            except:
-                pass
+    for msg in islice(reversed(history), 10):
+        if _load_rag_results(msg):
+            return True
     return False
 
 
 def get_rag_results_from_history(history: List[Dict[str, str]]) -> List[Dict[str, Any]]:
     """히스토리에서 가장 최근 RAG 결과 추출"""
-    for msg in reversed(history[-10:]):
-        if msg.get("role") == "system":
-            try:
-                content = json.loads(msg["content"])
-                if "rag_results" in content:
-                    return content["rag_results"]
-            except:
-                pass
+    for msg in islice(reversed(history), 10):
+        rag_results = _load_rag_results(msg)
+        if rag_results is not None:
+            return rag_results
     return []
 
 
+# 6️⃣ 보정 규칙 (자주 등장하는 표현)
+_KEYWORD_CITY_MAP = {
+    "한강": "서울", "청계천": "서울", "남산": "서울", "광안리": "부산",
+    "감천문화마을": "부산", "남이섬": "가평", "설악산": "속초", "에버랜드": "용인",
+    "롯데월드": "서울", "경주월드": "경주", "전주한옥마을": "전주",
+    "한라산": "제주", "성심당": "대전"
+}
+
+
+def _build_location_patterns() -> List[Tuple[str, str]]:
+    """
+    (키워드, 대표 도시) 목록을 우선순위 순서대로 구성
+    
+    1️⃣ KMA 지역코드 → 2️⃣ 동 → 3️⃣ 명소 → 4️⃣ 대학교 → 5️⃣ 확장명소/상권 → 6️⃣ 보정 규칙
+    같은 키워드는 먼저 등장한(우선순위가 높은) 매핑만 유지합니다.
+    """
+    pairs: List[Tuple[str, str]] = [(city, city) for city in KMA_LOCATION_CODES]
+    pairs += list(DONG_TO_CITY.items())
+    pairs += list(LANDMARK_TO_CITY.items())
+    pairs += list(UNIVERSITY_TO_CITY.items())
+    pairs += [(name, city) for city, names in LOCATION_MAP.items() for name in names]
+    pairs += list(_KEYWORD_CITY_MAP.items())
+
+    seen = set()
+    patterns = []
+    for keyword, city in pairs:
+        if keyword and keyword not in seen:
+            seen.add(keyword)
+            patterns.append((keyword, city))
+    return patterns
+
+
+_LOCATION_PATTERNS = _build_location_patterns()
+
+# Aho-Corasick 오토마톤: 텍스트를 한 번만 훑어 모든 위치 키워드를 찾음
+# (payload = (우선순위, 도시) → 가장 높은 우선순위 매칭을 선택해 기존 순차 검사와 동일한 결과)
+if ahocorasick is not None:
+    _LOCATION_AC = ahocorasick.Automaton()
+    for _priority, (_keyword, _city) in enumerate(_LOCATION_PATTERNS):
+        _LOCATION_AC.add_word(_keyword, (_priority, _city))
+    _LOCATION_AC.make_automaton()
+else:
+    _LOCATION_AC = None
+
+
+def _match_location_keyword(text: str) -> Optional[str]:
+    """우선순위가 가장 높은 위치 키워드의 대표 도시 반환"""
+    if _LOCATION_AC is not None:
+        best = min((payload for _, payload in _LOCATION_AC.iter(text)), default=None)
+        return best[1] if best else None
+    return next((city for keyword, city in _LOCATION_PATTERNS if keyword in text), None)
+
+
+# 7️⃣ 패턴기반 추론 규칙: (접미 키워드, ((도시, 힌트 키워드들), ...)) — 위에서부터 우선
+_LOCATION_PATTERN_RULES = (
+    ("카페거리", (("서울", ("성수", "홍대", "연남")), ("제주", ("애월",)), ("부산", ("온천천",)))),
+    ("해수욕장", (("부산", ("광안", "해운대", "송정")), ("제주", ("함덕", "협재")),
+                ("강릉", ("낙산", "경포")), ("보령", ("대천",)))),
+    ("시장", (("서울", ("남대문", "광장", "통인")), ("대구", ("서문",)), ("부산", ("자갈치", "국제시장")))),
+)
+
+# 규칙에 쓰이는 모든 키워드를 한 번의 스캔으로 수집 (lookahead로 "국제시장" 안의 "시장"처럼 겹친 매칭도 포함)
+_LOCATION_PATTERN_RE = re.compile("(?=({}))".format("|".join(sorted(
+    {anchor for anchor, _ in _LOCATION_PATTERN_RULES}
+    | {hint for _, cities in _LOCATION_PATTERN_RULES for _, hints in cities for hint in hints},
+    key=len,
+    reverse=True
+))))
+
+
+def _match_location_pattern(text: str) -> Optional[str]:
+    """접미 키워드 + 힌트 조합으로 도시 추론 (매칭 없으면 None)"""
+    found = set(_LOCATION_PATTERN_RE.findall(text))
+    if not found:
+        return None
+    for anchor, cities in _LOCATION_PATTERN_RULES:
+        if anchor in found:
+            for city, hints in cities:
+                if not found.isdisjoint(hints):
+                    return city
+    return None
+
+
 def extract_location(text: str) -> Optional[str]:
     """
     사용자가 입력한 텍스트에서 도시/구/동/명소 등 위치를 최대한 정밀하게 인식해
     대표 도시명(예: 서울, 부산, 제주 등)으로 반환.
     """
+    # 공백 제거 (예: "한 남 동" → "한남동") 후 정규화된 문자열 기준으로 캐시
+    return _extract_location_normalized(text.strip().replace(" ", ""))
 
-    text = text.strip().replace(" ", "")  # 공백 제거 (예: "한 남 동" → "한남동")
-
-    # 1️⃣ KMA 지역코드 기반: 도시/군/구 단위 직접 매칭
-    for city in KMA_LOCATION_CODES.keys():
-        if city in text:
-            return city
-
-    # 2️⃣ DONG_TO_CITY: 동(洞) → 도시 매핑
-    for dong, city in DONG_TO_CITY.items():
-        if dong in text:
-            return city
-
-    # 3️⃣ LANDMARK_TO_CITY: 명소/관광지 → 도시 매핑
-    for landmark, city in LANDMARK_TO_CITY.items():
-        if landmark in text:
-            return city
-
-    # 4️⃣ UNIVERSITY_TO_CITY: 대학교 → 도시 매핑
-    for univ, city in UNIVERSITY_TO_CITY.items():
-        if univ in text:
-            return city
-
-    # 5️⃣ LOCATION_MAP: 추가 확장명소/상권 등
-    for city, names in LOCATION_MAP.items():
-        for name in names:
-            if name in text:
-                return city
-
-    # 6️⃣ 보정 규칙 (자주 등장하는 표현)
-    keyword_city_map = {
-        "한강": "서울", "청계천": "서울", "남산": "서울", "광안리": "부산",
-        "감천문화마을": "부산", "남이섬": "가평", "설악산": "속초", "에버랜드": "용인",
-        "롯데월드": "서울", "경주월드": "경주", "전주한옥마을": "전주",
-        "한라산": "제주", "성심당": "대전"
-    }
-    for kw, city in keyword_city_map.items():
-        if kw in text:
-            return city
 
-    # 7️⃣ 패턴기반 추론 (예: ~카페거리, ~해수욕장, ~시장)
-    if "카페거리" in text:
-        if "성수" in text or "홍대" in text or "연남" in text:
-            return "서울"
-        if "애월" in text:
-            return "제주"
-        if "온천천" in text:
-            return "부산"
-    if "해수욕장" in text:
-        if "광안" in text or "해운대" in text or "송정" in text:
-            return "부산"
-        if "함덕" in text or "협재" in text:
-            return "제주"
-        if "낙산" in text or "경포" in text:
-            return "강릉"
-        if "대천" in text:
-            return "보령"
-    if "시장" in text:
-        if "남대문" in text or "광장" in text or "통인" in text:
-            return "서울"
-        if "서문" in text:
-            return "대구"
-        if "자갈치" in text or "국제시장" in text:
-            return "부산"
+@lru_cache(maxsize=2048)
+def _extract_location_normalized(text: str) -> Optional[str]:
+    """공백이 제거된 텍스트에서 위치 추출 (같은 문장은 캐시된 결과 반환)"""
+    # 1️⃣~6️⃣ 지역코드/동/명소/대학교/확장명소/보정 규칙 (단일 패스 매칭)
+    city = _match_location_keyword(text)
+    if city:
+        return city
 
-    return None
+    # 7️⃣ 패턴기반 추론 (예: ~카페거리, ~해수욕장, ~시장)
+    return _match_location_pattern(text)
 
 
 def extract_location_from_history(history: List[Dict[str, str]]) -> Optional[str]:
     """대화 히스토리에서 위치 정보 찾기"""
-    for msg in reversed(history[-10:]):
+    for msg in islice(reversed(history), 10):
         if msg["role"] == "user":
             location = extract_location(msg["content"])
             if location:
@@ -264,23 +428,29 @@ def extract_location_from_history(history: List[Dict[str, str]]) -> Optional[str
     return None
 
 
+# 날짜 키워드 (dict 순서 = 우선순위)
+_DATE_KEYWORDS = {
+    "오늘": "today",
+    "내일": "tomorrow",
+    "모레": "day_after_tomorrow",
+    "이번주": "this_week",
+    "다음주": "next_week",
+    "주말": "weekend"
+}
+_DATE_KEYWORD_PRIORITY = {keyword: i for i, keyword in enumerate(_DATE_KEYWORDS)}
+_DATE_KW_RE = re.compile("|".join(_DATE_KEYWORDS))
+_DATE_ISO_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+@lru_cache(maxsize=2048)
 def extract_date(text: str) -> Optional[str]:
     """날짜 정보 추출"""
-    date_keywords = {
-        "오늘": "today",
-        "내일": "tomorrow",
-        "모레": "day_after_tomorrow",
-        "이번주": "this_week",
-        "다음주": "next_week",
-        "주말": "weekend"
-    }
-    
-    for keyword, value in date_keywords.items():
-        if keyword in text:
-            return value
+    # 키워드가 여러 개면 기존과 같이 우선순위가 높은 키워드 선택
+    keywords = [m.group() for m in _DATE_KW_RE.finditer(text)]
+    if keywords:
+        return _DATE_KEYWORDS[min(keywords, key=_DATE_KEYWORD_PRIORITY.__getitem__)]
     
-    date_pattern = r'\d{4}-\d{2}-\d{2}'
-    match = re.search(date_pattern, text)
+    match = _DATE_ISO_RE.search(text)
     if match:
         return match.group()
     
@@ -294,18 +464,23 @@ def extract_date(text: str) -> Optional[str]:
 def run_agent(
     user_query: str, 
     conversation_id: str, 
-    conversation_history: List[Dict[str, str]] = None
+    conversation_history: List[Dict[str, str]] = None,
+    on_token: Optional[Callable[[str], None]] = None
 ) -> Dict[str, Any]:
     """
     개선된 Agent 실행 로직
     
+    Args:
+        on_token: 스트리밍 콜백 (답변 텍스트 조각을 생성 순서대로 전달)
+    
     Returns:
         {
             "answer": str,
             "conversation_history": List[Dict],
             "tools_used": List[str],
-            "query_analysis": Dict,
+            "query_analysis": QueryAnalysis,
             "response_type": str,  # "text" or "map"
+            "cacheable": bool,  # 실제 날씨·RAG·LLM 결과로 만든 답변인지 (응답 캐시 저장 가능 여부)
             "map_data": Dict (optional),
             "map_link": str (optional)
         }
@@ -314,10 +489,22 @@ def run_agent(
     
     history = conversation_history or []
     
-    # 1단계: 쿼리 분석
-    analysis = analyze_user_query(user_query, history)
+    # 1단계: 쿼리 분석 (히스토리가 있을 때만 이전 위치 재사용)
+    last_location = get_cached_location(conversation_id) if history else None
+    analysis = analyze_user_query(user_query, history, last_location)
     logger.info(f"📊 쿼리 분석 결과: {analysis}")
     
+    if analysis.location:
+        save_cached_location(conversation_id, analysis.location)
+    
+    # LLM 토큰 스트리밍 여부 추적
+    streamed = False
+    
+    def _emit(chunk: str) -> None:
+        nonlocal streamed
+        streamed = True
+        on_token(chunk)
+    
     # 초기화
     answer = ""
     tools_used = []
@@ -325,38 +512,43 @@ def run_agent(
     map_link = None
     rag_results = []
     response_type = "text"
+    cacheable = False
     
     # 2단계: 타입별 처리
-    if analysis["type"] == "emotion":
+    if analysis.type == "emotion":
         answer = _generate_emotion_response(user_query)
         response_type = "text"
     
-    elif analysis["type"] == "show_map":
+    elif analysis.type == "show_map":
         # 지도 요청 → map 응답 (4개 값 반환)
         result_tuple = _handle_map_request(history)
         answer, tools_used, map_data, map_link = result_tuple
         response_type = "map" if map_data else "text"
     
-    elif analysis["type"] == "need_location":
-        answer = "어느 지역을 생각하고 계신가요? 🗺️\n(예: 서울 강남, 부산 해운대)"
+    elif analysis.type == "need_location":
+        answer = _NEED_LOCATION_ANSWER
         response_type = "text"
     
     else:  # type == "ready"
-        answer, tools_used, rag_results = _handle_location_query(
+        answer, tools_used, rag_results, cacheable = _handle_location_query(
             user_query, 
-            analysis["location"], 
-            analysis["date"]
+            analysis.location, 
+            analysis.date,
+            on_token=_emit if on_token else None
         )
         response_type = "text"
     
-    # 히스토리 업데이트
-    new_history = history + [
-        {"role": "user", "content": user_query},
-        {"role": "ai", "content": answer}
-    ]
+    # 스트리밍 콜백으로 답변 전달 (LLM이 토큰 단위로 이미 전달한 경우 생략)
+    if on_token and not streamed:
+        on_token(answer)
+    
+    # 히스토리 업데이트 (호출자 리스트는 그대로 두고 한 번만 복사한 뒤 이어서 추가)
+    new_history = list(history)
+    new_history.append({"role": "user", "content": user_query})
+    new_history.append({"role": "ai", "content": answer})
     
     # RAG 결과를 system 메시지로 저장 (지도 요청 대비)
-    if analysis["type"] == "ready" and rag_results:
+    if analysis.type == "ready" and rag_results:
         new_history = _append_rag_metadata(new_history, rag_results)
     
     logger.info(f"✅ Agent 완료 (도구: {tools_used}, 응답 타입: {response_type})")
@@ -367,7 +559,8 @@ def run_agent(
         "conversation_history": new_history,
         "tools_used": tools_used,
         "query_analysis": analysis,
-        "response_type": response_type
+        "response_type": response_type,
+        "cacheable": cacheable
     }
     
     # 지도 데이터가 있으면 추가
@@ -383,20 +576,13 @@ def run_agent(
 # ============================================================
 
 def _generate_emotion_response(query: str) -> str:
-    """감정 표현에 대한 응답"""
-    responses = {
-        "고마": "천만에요! 😊 더 궁금한 점이 있으시면 언제든 말씀해주세요!",
-        "감사": "도움이 되었다니 기쁩니다! 🎉 또 필요하신 게 있으시면 말씀해주세요!",
-        "좋아": "마음에 드셨다니 정말 기쁩니다! 😄 즐거운 시간 보내세요!",
-        "최고": "감사합니다! 😊 항상 최선을 다하겠습니다!",
-        "완벽": "완벽하다는 말씀 감사합니다! ✨ 즐거운 시간 되세요!"
-    }
-    
-    for keyword, response in responses.items():
-        if keyword in query:
+    """감정 표현에 대한 응답 (분석 단계의 키워드 스캔 결과 재사용)"""
+    tags = _keyword_tags(query)
+    for keyword, response in _EMOTION_RESPONSES.items():
+        if "reply:" + keyword in tags:
             return response
     
-    return "말씀해주셔서 감사합니다! 😊 더 도와드릴 것이 있을까요?"
+    return _EMOTION_DEFAULT_RESPONSE
 
 
 def _handle_map_request(
@@ -447,15 +633,13 @@ def _handle_map_request(
             None
         )
     
-    # get_map_markers 호출
+    # 지도 데이터 생성 (JSON 왕복 없이 리스트 그대로 전달)
     try:
-        map_result = get_map_markers(json.dumps(markers, ensure_ascii=False))
+        map_result = get_map_markers_from_list(markers)
         
-        answer = f"🗺️ 지도 정보를 불러왔어요! {len(markers)}개의 위치를 지도에 표시했습니다.\n\n"
-        answer += "📍 표시된 장소:\n"
-        
-        for i, marker in enumerate(markers[:5], 1):
-            answer += f"{i}. {marker['name']}\n"
+        parts = [f"🗺️ 지도 정보를 불러왔어요! {len(markers)}개의 위치를 지도에 표시했습니다.\n\n📍 표시된 장소:\n"]
+        parts.extend(f"{i}. {marker['name']}\n" for i, marker in enumerate(markers[:5], 1))
+        answer = "".join(parts)
         
         map_data = {
             "center": map_result["center"],
@@ -481,29 +665,65 @@ def _handle_map_request(
 def _handle_location_query(
     query: str, 
     location: str, 
-    date_info: Optional[str]
-) -> Tuple[str, List[str], List[Dict[str, Any]]]:
+    date_info: Optional[str],
+    on_token: Optional[Callable[[str], None]] = None
+) -> Tuple[str, List[str], List[Dict[str, Any]], bool]:
     """
     위치 정보가 있는 쿼리 처리
     
+    on_token이 주어지면 LLM 답변을 생성되는 대로 토큰 단위로 전달
+    
     Returns:
-        (answer, tools_used, rag_results)
+        (answer, tools_used, rag_results, cacheable)
+        cacheable: 날씨 오류/Mock, Mock RAG 결과, Mock 답변 없이 만든 답변이면 True
     """
-    weather_result = _call_weather_tool(location, date_info)
+    tools_used = ["weather_tool", "rag_search_tool"]
+    
+    cache_key = _agent_cache_key(query, location, date_info)
+    if _settings.AGENT_CACHE_ENABLED:
+        cached = _AGENT_CACHE.get(cache_key)
+        if cached is not None:
+            logger.info(f"⚡ Agent 캐시 적중: '{query}' ({location}, {date_info})")
+            answer, rag_results = cached
+            return answer, tools_used, rag_results, True
+    
+    # 날씨 조회(외부 API)와 RAG 검색을 동시에 실행
+    weather_future = _TOOL_EXECUTOR.submit(_call_weather_tool, location, date_info)
     rag_results = _call_rag_tool(query, location)
+    weather_result = weather_future.result()
+    
+    # 날씨 조회 실패·Mock 결과(API 키 없음 포함)는 실제 날씨가 아니므로 캐시하지 않음
+    cacheable = (
+        "error" not in weather_result
+        and weather_result.get("source") != "mock"
+        and bool(rag_results)
+    )
     
     if not rag_results:
         logger.warning("⚠️ RAG 결과 없음 - Mock 데이터 사용")
         rag_results = _get_mock_rag_results(location)
     
-    answer = _generate_final_answer(
+    answer, from_llm = _generate_final_answer(
         query=query,
         location=location,
         weather=weather_result,
-        facilities=rag_results
+        facilities=rag_results,
+        on_token=on_token
     )
+    # LLM 실패로 Mock 답변이 나간 경우도 캐시하지 않음
+    cacheable = cacheable and from_llm
+    
+    if cacheable and _settings.AGENT_CACHE_ENABLED:
+        _AGENT_CACHE.set(cache_key, (answer, rag_results))
     
-    return answer, ["weather_tool", "rag_search_tool"], rag_results
+    return answer, tools_used, rag_results, cacheable
+
+
+def _agent_cache_key(query: str, location: str, date_info: Optional[str]) -> bytes:
+    """정규화된 (질문, 지역, 날짜) → 고정 길이 캐시 키"""
+    normalized = " ".join(query.lower().split())
+    raw = f"{normalized}|{location}|{date_info}".encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).digest()
 
 
 def _call_weather_tool(location: str, date_info: Optional[str]) -> Dict[str, Any]:
@@ -528,20 +748,9 @@ def _call_rag_tool(query: str, location: str) -> List[Dict[str, Any]]:
     try:
         rag_service = get_rag_service()
         
-        filters = None
-        parts = location.split()
-        
-        if len(parts) >= 2:
-            filters = {
-                "$and": [
-                    {"ctprvn_nm": {"$eq": parts[0]}},
-                    {"signgu_nm": {"$eq": parts[1]}}
-                ]
-            }
-            logger.info(f"🔍 필터 적용: {parts[0]} + {parts[1]}")
-        elif len(parts) == 1:
-            filters = {"ctprvn_nm": {"$eq": parts[0]}}
-            logger.info(f"🔍 필터 적용: {parts[0]}")
+        filters = _build_location_filters(location)
+        if filters:
+            logger.info(f"🔍 필터 적용: {location}")
         
         results = rag_service.search_and_rerank(
             query=query,
@@ -612,63 +821,191 @@ def _generate_final_answer(
     query: str,
     location: str,
     weather: Dict[str, Any],
-    facilities: List[Dict[str, Any]]
-) -> str:
-    """최종 답변 생성"""
+    facilities: List[Dict[str, Any]],
+    on_token: Optional[Callable[[str], None]] = None
+) -> Tuple[str, bool]:
+    """
+    최종 답변 생성 (생성 서버 → 로컬 GPU 모델 → Mock 순으로 시도)
+    
+    Returns:
+        (answer, from_llm) - Mock 답변으로 대체되었으면 from_llm=False
+    """
     llm_service = get_llm_service()
     
+    # 이미 클라이언트로 토큰이 나간 뒤에는 다른 답변으로 대체하지 않음 (스트림이 두 답변으로 섞이지 않도록)
+    emitted = False
+    
+    def _emit(chunk: str) -> None:
+        nonlocal emitted
+        emitted = True
+        on_token(chunk)
+    
+    if _settings.LLM_SERVER_URL:
+        try:
+            prompt = _build_answer_prompt(query, location, weather, facilities)
+            return llm_service.complete_remote(prompt, max_tokens=300, on_token=_emit if on_token else None), True
+        except Exception as e:
+            if emitted:
+                logger.error(f"❌ LLM 서버 스트리밍 중단 (일부 토큰 전송됨): {e}")
+                raise
+            logger.error(f"❌ LLM 서버 생성 실패 → 로컬 생성으로 대체: {e}")
+    
     if llm_service._use_gpu and llm_service._model:
         try:
-            return _generate_with_llm(query, location, weather, facilities, llm_service)
+            return _generate_with_llm(query, location, weather, facilities, llm_service, _emit if on_token else None), True
         except Exception as e:
+            if emitted:
+                logger.error(f"❌ LLM 스트리밍 중단 (일부 토큰 전송됨): {e}")
+                raise
             logger.error(f"❌ LLM 생성 실패: {e}")
     
-    return _generate_mock_answer(location, weather, facilities)
+    return _generate_mock_answer(location, weather, facilities), False
+
 
+# 모든 요청에서 바이트 단위로 동일한 지시문 (KV/prefix 캐시가 재사용할 수 있도록 프롬프트 맨 앞에 위치)
+_ANSWER_PROMPT_PREFIX = """아래 정보를 바탕으로 사용자 질문에 친절하게 답변해주세요.
 
-def _generate_with_llm(query, location, weather, facilities, llm_service) -> str:
-    """실제 LLM으로 답변 생성"""
-    context = f"위치: {location}\n"
-    context += f"날씨: {weather.get('description', '알 수 없음')} ({weather.get('temp', 0)}°C)\n\n"
-    context += "추천 시설:\n"
+답변 작성 가이드:
+- 날씨 정보를 먼저 언급
+- 추천 시설 3개를 구체적으로 소개
+- 이모지 사용 (🎨, 🏃‍♂️, 📍)
+- 따뜻하고 친근한 톤
+
+"""
+
+
+def _build_answer_prompt(query, location, weather, facilities) -> str:
+    """답변 생성 프롬프트 구성 (고정 지시문 + 요청별 컨텍스트/질문)"""
+    context = _build_answer_context(location, weather, facilities)
     
+    # 고정 지시문을 앞에, 요청마다 달라지는 컨텍스트/질문을 뒤에 배치 (프롬프트 prefix 재사용)
+    return _ANSWER_PROMPT_PREFIX + _build_answer_suffix(query, context)
+
+
+def _build_answer_context(location, weather, facilities) -> str:
+    """위치 · 날씨 · 추천 시설 컨텍스트"""
+    parts = [
+        f"위치: {location}\n날씨: {weather.get('description', '알 수 없음')} ({weather.get('temp', 0)}°C)\n\n",
+        "추천 시설:\n"
+    ]
     for i, doc in enumerate(facilities[:3], 1):
         meta = doc.get("metadata", {})
-        context += f"{i}. {meta.get('facility_name', 'N/A')}\n"
-        context += f"   - 위치: {meta.get('signgu_nm', '')}\n"
-        context += f"   - 분류: {meta.get('category1', '')}\n"
-        context += f"   - 가격: {meta.get('price', '무료')}\n\n"
+        parts.append(
+            f"{i}. {meta.get('facility_name', 'N/A')}\n"
+            f"   - 위치: {meta.get('signgu_nm', '')}\n"
+            f"   - 분류: {meta.get('category1', '')}\n"
+            f"   - 가격: {meta.get('price', '무료')}\n\n"
+        )
+    return "".join(parts)
+
+
+def _build_answer_suffix(query: str, context: str) -> str:
+    """프롬프트 중 요청마다 달라지는 부분"""
+    return f"{context}\n\n사용자 질문: {query}\n\n답변:"
+
+
+_PROMPT_MAX_LENGTH = 1024
+
+
+@lru_cache(maxsize=1)
+def _answer_gen_config():
+    """로컬 생성 설정 (첫 GPU 생성 시 한 번만 생성)"""
+    return GenerationConfig(temperature=0.7, max_new_tokens=300, top_p=0.9, use_cache=True)
+
+
+@lru_cache(maxsize=4)
+def _answer_prefix_ids(tokenizer) -> "torch.Tensor":
+    """고정 지시문 토큰 ID (토크나이저별로 한 번만 토크나이즈)"""
+    return tokenizer(_ANSWER_PROMPT_PREFIX, return_tensors="pt").input_ids
+
+
+@lru_cache(maxsize=4)
+def _answer_prefix_split_ok(tokenizer) -> bool:
+    """
+    지시문/요청별 부분을 따로 토크나이즈해 이어붙인 결과가 전체 프롬프트 토크나이즈와 같은지 확인
     
-    prompt = f"""아래 정보를 바탕으로 사용자 질문에 친절하게 답변해주세요.
+    지시문은 개행으로 끝나고 요청별 부분은 항상 "위치:"로 시작하므로 경계 토큰은 요청과 무관 →
+    토크나이저별로 한 번만 확인. 다르면 전체 프롬프트를 한 번에 토크나이즈하고 지시문 KV 캐시도 쓰지 않음
+    """
+    suffix = _build_answer_suffix("질문", _build_answer_context("서울", {}, []))
+    split_ids = torch.cat([_answer_prefix_ids(tokenizer), _answer_suffix_ids(tokenizer, suffix)], dim=1)
+    full_ids = tokenizer(_ANSWER_PROMPT_PREFIX + suffix, return_tensors="pt").input_ids
+    if torch.equal(split_ids, full_ids):
+        return True
+    logger.warning("⚠️ 지시문 경계에서 토큰이 달라짐 → 전체 프롬프트 토크나이즈, 지시문 KV 캐시 미사용")
+    return False
 
-{context}
 
-사용자 질문: {query}
+@lru_cache(maxsize=4)
+def _answer_prefix_cache(model, tokenizer):
+    """
+    고정 지시문의 KV 캐시 (모델별로 한 번만 prefill)
+    
+    Cache 객체를 돌려주지 않는 구버전 transformers에서는 None (재사용 안 함)
+    """
+    try:
+        prefix_ids = _answer_prefix_ids(tokenizer).to(model.device)
+        with torch.inference_mode():
+            past = model(input_ids=prefix_ids, use_cache=True).past_key_values
+    except Exception as e:
+        logger.warning(f"⚠️ 지시문 KV 캐시 생성 실패 → 매번 전체 prefill: {e}")
+        return None
+    if not hasattr(past, "get_seq_length"):
+        return None
+    logger.info(f"✅ 지시문 KV 캐시 준비: {prefix_ids.shape[1]} 토큰")
+    return past
 
-답변 작성 가이드:
-- 날씨 정보를 먼저 언급
-- 추천 시설 3개를 구체적으로 소개
-- 이모지 사용 (🎨, 🏃‍♂️, 📍)
-- 따뜻하고 친근한 톤
 
-답변:"""
+@lru_cache(maxsize=256)
+def _answer_suffix_ids(tokenizer, suffix: str) -> "torch.Tensor":
+    """
+    요청별 부분(컨텍스트 + 질문)의 토큰 ID
     
-    from transformers import GenerationConfig
-    inputs = llm_service._tokenizer(
-        prompt,
-        return_tensors="pt",
-        truncation=True,
-        max_length=1024
-    ).to(llm_service._model.device)
+    조각별로 나눠 토크나이즈하면 BPE 병합이 경계에서 달라지므로 전체 문자열 단위로 토크나이즈하고,
+    같은 지역·질문이 반복될 때만 재사용합니다.
+    """
+    return tokenizer(suffix, return_tensors="pt", add_special_tokens=False).input_ids
+
+
+def _tokenize_answer_prompt(query, location, weather, facilities, tokenizer) -> Dict[str, Any]:
+    """캐시된 지시문 토큰 + 요청별 부분 토큰을 이어붙임 (경계 토큰이 달라지는 토크나이저는 전체 토크나이즈)"""
+    suffix = _build_answer_suffix(query, _build_answer_context(location, weather, facilities))
+    if not _answer_prefix_split_ok(tokenizer):
+        return tokenizer(
+            _ANSWER_PROMPT_PREFIX + suffix,
+            return_tensors="pt",
+            truncation=True,
+            max_length=_PROMPT_MAX_LENGTH
+        )
+    prefix_ids = _answer_prefix_ids(tokenizer)
+    input_ids = torch.cat([prefix_ids, _answer_suffix_ids(tokenizer, suffix)], dim=1)
+    # 길이 제한은 기존과 같이 앞쪽 토큰만 유지
+    input_ids = input_ids[:, :max(_PROMPT_MAX_LENGTH, prefix_ids.shape[1] + 1)]
+    return {"input_ids": input_ids, "attention_mask": torch.ones_like(input_ids)}
+
+
+def _generate_with_llm(query, location, weather, facilities, llm_service, on_token=None) -> str:
+    """
+    실제 LLM으로 답변 생성
     
-    gen_cfg = GenerationConfig(
-        temperature=0.7,
-        max_new_tokens=300,
-        top_p=0.9
-    )
+    on_token이 주어지면 TextIteratorStreamer로 생성 스레드에서 나오는 토큰을 바로 전달
+    """
+    inputs = _tokenize_answer_prompt(query, location, weather, facilities, llm_service._tokenizer)
+    inputs = {name: tensor.to(llm_service._model.device) for name, tensor in inputs.items()}
+    gen_cfg = _answer_gen_config()
+    
+    # 지시문 부분은 캐시된 KV에서 이어서 prefill (generate가 캐시를 늘리므로 사본 전달)
+    prefix_cache = None
+    if _answer_prefix_split_ok(llm_service._tokenizer):
+        prefix_cache = _answer_prefix_cache(llm_service._model, llm_service._tokenizer)
+    if prefix_cache is not None:
+        with torch.inference_mode():
+            inputs["past_key_values"] = copy.deepcopy(prefix_cache)
     
-    import torch
-    with torch.no_grad():
+    if on_token:
+        return _stream_with_llm(inputs, gen_cfg, llm_service, on_token)
+    
+    with torch.inference_mode():
         out = llm_service._model.generate(**inputs, generation_config=gen_cfg)
     
     answer = llm_service._tokenizer.decode(out[0], skip_special_tokens=True)
@@ -677,19 +1014,50 @@ def _generate_with_llm(query, location, weather, facilities, llm_service) -> str
     return answer
 
 
+def _stream_with_llm(inputs, gen_cfg, llm_service, on_token: Callable[[str], None]) -> str:
+    """백그라운드 스레드에서 generate 실행, 디코딩된 조각을 순서대로 on_token에 전달"""
+    streamer = TextIteratorStreamer(
+        llm_service._tokenizer,
+        skip_prompt=True,
+        skip_special_tokens=True
+    )
+    error: List[BaseException] = []
+    
+    def _generate() -> None:
+        try:
+            with torch.inference_mode():
+                llm_service._model.generate(**inputs, generation_config=gen_cfg, streamer=streamer)
+        except BaseException as e:
+            error.append(e)
+            streamer.end()
+    
+    worker = threading.Thread(target=_generate, name="llm-stream", daemon=True)
+    worker.start()
+    
+    chunks = []
+    for chunk in streamer:
+        if chunk:
+            chunks.append(chunk)
+            on_token(chunk)
+    worker.join()
+    
+    if error:
+        raise error[0]
+    return "".join(chunks).strip()
+
+
 def _generate_mock_answer(location: str, weather: Dict[str, Any], facilities: List[Dict[str, Any]]) -> str:
     """Mock 답변 생성"""
     weather_desc = weather.get("description", "맑음")
     temp = weather.get("temp", 15)
     weather_emoji = {"맑음": "☀️", "비": "🌧️", "흐림": "☁️", "눈": "❄️"}.get(weather_desc, "🌤️")
     
-    answer = f"{weather_emoji} {location} 날씨는 {weather_desc}이고, 기온은 {temp}°C예요!\n\n"
-    answer += "추천 장소를 찾았어요! 🎉\n\n"
+    header = f"{weather_emoji} {location} 날씨는 {weather_desc}이고, 기온은 {temp}°C예요!\n\n추천 장소를 찾았어요! 🎉\n\n"
     
     if not facilities:
-        answer += "죄송해요, 검색 결과가 없습니다. 다른 지역을 시도해보세요! 😢"
-        return answer
+        return header + "죄송해요, 검색 결과가 없습니다. 다른 지역을 시도해보세요! 😢"
     
+    parts = [header]
     for i, doc in enumerate(facilities[:3], 1):
         meta = doc.get("metadata", {})
         name = meta.get("facility_name", "Unknown")
@@ -697,12 +1065,11 @@ def _generate_mock_answer(location: str, weather: Dict[str, Any], facilities: Li
         gu = meta.get("signgu_nm", "")
         price = meta.get("price", "무료")
         
-        answer += f"{i}. 📍 **{name}** ({gu})\n"
-        answer += f"   분류: {category} | 가격: {price}\n\n"
+        parts.append(f"{i}. 📍 **{name}** ({gu})\n   분류: {category} | 가격: {price}\n\n")
     
-    answer += "즐거운 시간 보내세요! 😊"
+    parts.append("즐거운 시간 보내세요! 😊")
     
-    return answer
+    return "".join(parts)
 
 
 def _append_rag_metadata(
@@ -732,7 +1099,7 @@ def _append_rag_metadata(
         if rag_metadata:
             history.append({
                 "role": "system",
-                "content": json.dumps({"rag_results": rag_metadata}, ensure_ascii=False)
+                "content": _dumps({"rag_results": rag_metadata})
             })
             logger.info(f"📌 RAG 결과 {len(rag_metadata)}개를 system 메시지로 저장")
     
@@ -6,21 +6,32 @@ LLM Service
 - CPU/Mock 환경: 간단한 Mock 답변 반환
 """
 
+import importlib.util
 import os
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Callable, Optional
+
+import httpx
+import orjson
 
 from utils.config import get_settings
+from utils.lazy import lazy_import
 from utils.logger import logger
 
-# GPU 전용 라이브러리 import 시도
+# GPU 전용 라이브러리 import 시도 (torch는 GPU 감지에 사용)
 try:
     import torch
-    from transformers import AutoTokenizer, AutoModelForCausalLM, GenerationConfig
 except ImportError:
     torch = None
-    AutoTokenizer = None
-    AutoModelForCausalLM = None
-    GenerationConfig = None
+
+# transformers는 모델을 실제로 로드할 때 import (Mock 환경에서는 import 비용 없음)
+_HAS_TRANSFORMERS = importlib.util.find_spec("transformers") is not None
+# flash-attn 설치 시 FlashAttention-2 커널 사용 (미설치 시 transformers 기본 SDPA)
+_HAS_FLASH_ATTN = importlib.util.find_spec("flash_attn") is not None
+AutoTokenizer = lazy_import("transformers.AutoTokenizer")
+AutoModelForCausalLM = lazy_import("transformers.AutoModelForCausalLM")
+GenerationConfig = lazy_import("transformers.GenerationConfig")
+BitsAndBytesConfig = lazy_import("transformers.BitsAndBytesConfig")
 
 
 class LLMService:
@@ -32,17 +43,28 @@ class LLMService:
         self._model = None
         self._model_name = None  # 🔥 추가: Agent에서 사용
         self._use_gpu = self._detect_gpu()
+        self._http: Optional[httpx.Client] = None
+
+        if self.settings.LLM_SERVER_URL:
+            # 원격 생성 서버 (vLLM/TGI) - 연결 재사용
+            self._http = httpx.Client(timeout=httpx.Timeout(60.0, connect=3.0))
+            logger.info(f"🔗 LLM 생성 서버 사용: {self.settings.LLM_SERVER_URL}")
+
+        if self._use_gpu and self.settings.LLM_SERVER_URL and not self.settings.LLM_LOCAL_FALLBACK:
+            # 원격 서버가 생성을 담당 → 워커마다 수 GB VRAM을 쓰는 로컬 모델은 로드하지 않음
+            self._use_gpu = False
+            logger.info("⏭️ LLM 생성 서버 사용 → 로컬 모델 로드 생략 (LLM_LOCAL_FALLBACK=true로 대체용 로드)")
 
         if self._use_gpu:
             self._load_model()
-        else:
+        elif not self.settings.LLM_SERVER_URL:
             logger.info("🔄 GPU 미검출 또는 라이브러리 미설치 → Mock 모드로 동작")
 
     def _detect_gpu(self) -> bool:
         """GPU 환경 감지 (Colab, CUDA 등)"""
         if os.getenv("COLAB_RELEASE_TAG"):
             return True
-        if AutoModelForCausalLM and torch and torch.cuda.is_available():
+        if _HAS_TRANSFORMERS and torch and torch.cuda.is_available():
             return True
         return False
 
@@ -53,12 +75,18 @@ class LLMService:
             self._model_name = model_name  # 🔥 추가: 모델명 저장
             
             logger.info(f"🔄 LLM 모델 로딩: {model_name}")
+            extra_kwargs = {}
+            if _HAS_FLASH_ATTN:
+                extra_kwargs["attn_implementation"] = "flash_attention_2"
+                logger.info("⚡ FlashAttention-2 사용")
             self._tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
             self._model = AutoModelForCausalLM.from_pretrained(
                 model_name, 
                 device_map="auto", 
-                torch_dtype=torch.float16, 
-                trust_remote_code=True
+                torch_dtype=self._compute_dtype(), 
+                trust_remote_code=True,
+                quantization_config=self._quantization_config(),
+                **extra_kwargs
             )
             self._model.eval()
             logger.info(f"✅ LLM 모델 로드 완료: {model_name}")
@@ -69,6 +97,87 @@ class LLMService:
             self._tokenizer = None
             self._model_name = None
     
+    @staticmethod
+    def _compute_dtype():
+        """BF16 지원 GPU(Ampere 이상)면 BF16, 아니면 FP16"""
+        if torch.cuda.is_available() and torch.cuda.is_bf16_supported():
+            return torch.bfloat16
+        return torch.float16
+
+    def _quantization_config(self):
+        """
+        LLM_QUANTIZATION 설정에 따른 bitsandbytes 양자화 설정
+        
+        - "4bit": NF4 가중치 + BF16/FP16 연산 (메모리 트래픽 약 1/4)
+        - "8bit": LLM.int8()
+        - 미설정/미지원: None (BF16/FP16 그대로)
+        """
+        mode = (self.settings.LLM_QUANTIZATION or "").lower()
+        if not mode:
+            return None
+        
+        if mode == "4bit":
+            logger.info("🗜️ 4bit(NF4) 양자화로 로드")
+            return BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_compute_dtype=self._compute_dtype(),
+                bnb_4bit_use_double_quant=True
+            )
+        if mode == "8bit":
+            logger.info("🗜️ 8bit 양자화로 로드")
+            return BitsAndBytesConfig(load_in_8bit=True)
+        
+        logger.warning(f"⚠️ 알 수 없는 LLM_QUANTIZATION 값: {mode} → 양자화 없이 로드")
+        return None
+
+    def complete_remote(
+        self,
+        prompt: str,
+        max_tokens: int = 300,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        OpenAI 호환 /v1/completions 서버(vLLM 등)로 답변 생성
+        
+        서버의 prefix caching이 동작하도록 프롬프트는 그대로 전달합니다.
+        on_token이 주어지면 스트리밍 응답의 조각을 순서대로 전달합니다.
+        """
+        if self._http is None:
+            raise RuntimeError("LLM_SERVER_URL이 설정되지 않았습니다")
+        
+        url = self.settings.LLM_SERVER_URL.rstrip("/") + "/v1/completions"
+        payload = {
+            "model": self.settings.GENERATION_MODEL,
+            "prompt": prompt,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "stream": on_token is not None,
+        }
+        
+        if on_token is None:
+            resp = self._http.post(url, json=payload)
+            resp.raise_for_status()
+            return resp.json()["choices"][0]["text"].strip()
+        
+        chunks = []
+        with self._http.stream("POST", url, json=payload) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                text = orjson.loads(data)["choices"][0].get("text", "")
+                if text:
+                    chunks.append(text)
+                    on_token(text)
+        return "".join(chunks).strip()
+
     def generate_answer(
         self,
         query: str,
@@ -96,7 +205,7 @@ class LLMService:
                 gen_cfg = GenerationConfig(temperature=0.7, max_new_tokens=256, top_p=0.9)
                 
                 # 4) 추론
-                with torch.no_grad():
+                with torch.inference_mode():
                     out = self._model.generate(**inputs, generation_config=gen_cfg)
                 text = self._tokenizer.decode(out[0], skip_special_tokens=True)
                 return text.split("Answer:")[-1].strip()
@@ -149,12 +258,19 @@ class LLMService:
 
 
 # 싱글톤 인스턴스
-_llm_service: LLMService = None
+_llm_service_instance: Optional[LLMService] = None
+_llm_service_lock = threading.Lock()
 
 
 def get_llm_service() -> LLMService:
-    """LLMService 싱글톤 반환"""
-    global _llm_service
-    if _llm_service is None:
-        _llm_service = LLMService()
-    return _llm_service
\ No newline at end of file
+    """LLMService 싱글톤 반환 (시작 시 워밍업 스레드와 요청 스레드가 동시에 호출해도 한 번만 생성)"""
+    global _llm_service_instance
+    
+    if _llm_service_instance is not None:
+        return _llm_service_instance
+    
+    with _llm_service_lock:
+        if _llm_service_instance is None:
+            _llm_service_instance = LLMService()
+    
+    return _llm_service_instance
@@ -7,10 +7,15 @@ KakaoMap API 연동 및 지도 마커 생성
 """
 
 from typing import List, Dict, Any
-import json
+
+import orjson
+
 from utils.logger import logger
 
 
+_DEFAULT_CENTER = {"lat": 37.5665, "lng": 126.9780}  # 서울 시청 기본값
+
+
 def get_map_markers(markers_json: str) -> Dict[str, Any]:
     """
     마커 리스트를 받아서 카카오맵 데이터 생성
@@ -30,30 +35,52 @@ def get_map_markers(markers_json: str) -> Dict[str, Any]:
     """
     try:
         # JSON 파싱
-        markers = json.loads(markers_json)
-        
+        markers = orjson.loads(markers_json)
+    except orjson.JSONDecodeError as e:
+        logger.error(f"❌ JSON 파싱 오류: {e}")
+        return {
+            "center": dict(_DEFAULT_CENTER),
+            "markers": [],
+            "link": "",
+            "error": "JSON 파싱 실패"
+        }
+    
+    return get_map_markers_from_list(markers)
+
+
+def get_map_markers_from_list(markers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    마커 리스트(파이썬 객체)로 카카오맵 데이터 생성
+    
+    내부 호출용: JSON 직렬화/파싱 왕복 없이 get_map_markers와 같은 결과를 반환합니다.
+    """
+    try:
         if not markers:
             logger.warning("⚠️ 마커가 비어있습니다")
             return {
-                "center": {"lat": 37.5665, "lng": 126.9780},  # 서울 시청 기본값
+                "center": dict(_DEFAULT_CENTER),
                 "markers": [],
                 "link": ""
             }
         
-        # 중심점 계산 (모든 마커의 평균 좌표)
-        avg_lat = sum(m["lat"] for m in markers) / len(markers)
-        avg_lng = sum(m["lng"] for m in markers) / len(markers)
-        
-        # 마커 데이터 구성 (desc 필드 추가 가능)
+        # 마커 데이터 구성 + 중심점 좌표 합산 (한 번의 순회)
         formatted_markers = []
+        sum_lat = sum_lng = 0.0
         for marker in markers:
+            lat, lng = marker["lat"], marker["lng"]
+            sum_lat += lat
+            sum_lng += lng
             formatted_markers.append({
                 "name": marker.get("name", "Unknown"),
-                "lat": marker["lat"],
-                "lng": marker["lng"],
+                "lat": lat,
+                "lng": lng,
                 "desc": marker.get("desc", "")  # 설명 (선택사항)
             })
         
+        # 중심점 계산 (모든 마커의 평균 좌표)
+        avg_lat = sum_lat / len(markers)
+        avg_lng = sum_lng / len(markers)
+        
         # 카카오맵 링크 생성
         # 첫 번째 마커를 기준으로 링크 생성
         first_marker = markers[0]
@@ -72,20 +99,11 @@ def get_map_markers(markers_json: str) -> Dict[str, Any]:
         
         return result
     
-    except json.JSONDecodeError as e:
-        logger.error(f"❌ JSON 파싱 오류: {e}")
-        return {
-            "center": {"lat": 37.5665, "lng": 126.9780},
-            "markers": [],
-            "link": "",
-            "error": "JSON 파싱 실패"
-        }
-    
     except Exception as e:
         logger.error(f"❌ 지도 생성 오류: {e}")
         return {
-            "center": {"lat": 37.5665, "lng": 126.9780},
+            "center": dict(_DEFAULT_CENTER),
             "markers": [],
             "link": "",
             "error": str(e)
-        }
\ No newline at end of file
+        }
@@ -6,11 +6,19 @@ RAG Service
 - 크로스인코더 리랭킹
 - MMR 다양성 필터링
 """
+import hashlib
 import os
+import threading
 from typing import List, Dict, Any, Optional
 
+import numpy as np
+import orjson
+
 from utils.config import get_settings
 from utils.logger import logger
+from utils.persistent_cache import get_persistent_cache
+from utils.semantic_cache import SemanticResultCache
+from utils.ttl_cache import TTLCache
 from utils.vector_client import get_vector_client
 
 class RAGService:
@@ -21,6 +29,15 @@ class RAGService:
         self.client = get_vector_client()
         self._cross_encoder = None
         self._use_gpu = self._detect_gpu()
+        self._result_cache: Optional[SemanticResultCache] = None
+        self._exact_cache: Optional[TTLCache] = None
+        if self.settings.RAG_CACHE_ENABLED:
+            self._exact_cache = TTLCache(self.settings.RAG_CACHE_SIZE, self.settings.RAG_CACHE_TTL)
+            self._result_cache = SemanticResultCache(
+                max_size=self.settings.RAG_CACHE_SIZE,
+                ttl=self.settings.RAG_CACHE_TTL,
+                threshold=self.settings.RAG_CACHE_THRESHOLD
+            )
 
         if self._use_gpu:
             self._load_reranker()
@@ -45,7 +62,9 @@ class RAGService:
             model_name = self.settings.RERANKER_MODEL
             logger.info(f"🔄 크로스인코더 로딩: {model_name}")
             self._cross_encoder = CrossEncoder(model_name, device="cuda")
-            logger.info("✅ 크로스인코더 로드 완료")
+            # FP16 추론 (리랭킹 점수 순서에는 영향 거의 없음, 처리량 약 2배)
+            self._cross_encoder.model.half()
+            logger.info("✅ 크로스인코더 로드 완료 (FP16)")
         except Exception as e:
             logger.error(f"❌ 크로스인코더 로드 실패: {e}")
             self._cross_encoder = None
@@ -69,16 +88,57 @@ class RAGService:
             k = top_k or self.settings.MMR_TOP_K
             logger.info(f"🔍 RAG 검색 시작: '{query}' (GPU={self._use_gpu})")
 
+            # 정확 매칭(메모리 → 영속) → 유사 쿼리 순으로 캐시 조회 (필터/옵션이 같은 경우만)
+            query_vec = None
+            cache_tag = None
+            exact_key = None
+            persistent = None
+            persistent_key = None
+            if self._result_cache is not None:
+                cache_tag = (orjson.dumps(filters, option=orjson.OPT_SORT_KEYS), k, use_multi_query, use_mmr)
+                exact_key = (" ".join(query.lower().split()), cache_tag)
+                cached = self._exact_cache.get(exact_key)
+                if cached is not None:
+                    logger.info(f"⚡ RAG 캐시 적중 (정확 매칭): {len(cached)}개 반환")
+                    return list(cached)
+                persistent = get_persistent_cache()
+                if persistent is not None:
+                    persistent_key = "rag:" + hashlib.blake2b(repr(exact_key).encode("utf-8"), digest_size=16).hexdigest()
+                    entry = persistent.get_with_ttl(persistent_key)
+                    if entry is not None:
+                        cached, remaining = entry
+                        logger.info(f"⚡ RAG 캐시 적중 (영속): {len(cached)}개 반환")
+                        # 남은 시간만큼만 메모리에 저장 (영속 캐시의 만료 시각 유지)
+                        self._exact_cache.set(exact_key, cached, ttl=remaining)
+                        return list(cached)
+                query_vec = self._normalized_query_vec(query)
+                cached = self._result_cache.get(query_vec, cache_tag)
+                if cached is not None:
+                    logger.info(f"⚡ RAG 캐시 적중: {len(cached)}개 반환")
+                    self._exact_cache.set(exact_key, cached)
+                    return list(cached)
+
             # 멀티쿼리
             queries = [query]
             if use_multi_query and self._use_gpu:
                 # TODO: LLM 기반 쿼리 확장 구현
                 pass
 
+            # 필터 선택도 확인 (후보가 적으면 해당 ID 안에서만 검색)
+            n_results = self.settings.TOP_K
+            candidate_ids = None
+            if filters:
+                candidate_ids = self._prefilter(filters)
+                if candidate_ids is not None:
+                    if not candidate_ids:
+                        logger.info("✅ 필터 조건에 맞는 문서 없음 → 임베딩/검색 생략")
+                        return []
+                    n_results = min(n_results, len(candidate_ids))
+
             # 초기 검색
             all_docs = []
             for q in queries:
-                res = self.client.search(q, n_results=self.settings.TOP_K, where=filters)
+                res = self.client.search(q, n_results=n_results, where=filters, ids=candidate_ids)
                 # res['documents'][0], res['metadatas'][0], res['distances'][0]
                 formatted = self._format_results(res)
                 all_docs.extend(formatted)
@@ -95,12 +155,43 @@ class RAGService:
             # MMR 필터링 (현재는 상위 N개 추출)
             final = unique_docs[:k] if use_mmr else unique_docs
             logger.info(f"✅ RAG 검색 완료: {len(final)}개 반환")
-            return final
+            if query_vec is not None and final:
+                self._result_cache.set(query_vec, cache_tag, final)
+                self._exact_cache.set(exact_key, final)
+                if persistent is not None:
+                    persistent.set(persistent_key, final, self.settings.RAG_CACHE_TTL)
+            return list(final)
 
         except Exception as e:
             logger.error(f"❌ RAG 검색 오류: {e}")
             return []
 
+    def _normalized_query_vec(self, query: str) -> np.ndarray:
+        """검색과 같은 임베딩 모델로 쿼리 임베딩 후 L2 정규화 (인코딩 결과는 VectorClient가 캐시)"""
+        vec = np.asarray(self.client.encode_query(query), dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def _prefilter(self, filters: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        메타데이터 필터만으로 후보 문서 ID 조회
+        
+        Returns:
+            후보 수가 임계값 이하이면 ID 리스트, 그 이상이면 None (일반 필터 검색)
+        """
+        threshold = self.settings.PREFILTER_SELECTIVITY_THRESHOLD
+        if threshold <= 0:
+            return None
+        try:
+            ids = self.client.get_candidate_ids(filters, limit=threshold + 1)
+        except Exception as e:
+            logger.warning(f"⚠️ 선택도 확인 실패 → 일반 필터 검색: {e}")
+            return None
+        if len(ids) > threshold:
+            return None
+        logger.info(f"🎯 선택도 높은 필터: 후보 {len(ids)}개 안에서 검색")
+        return ids
+
     def _format_results(self, res: Dict[str, Any]) -> List[Dict[str, Any]]:
         """ChromaDB 결과 포맷 변환"""
         docs, metas, dists = res["documents"][0], res["metadatas"][0], res["distances"][0]
@@ -127,27 +218,42 @@ class RAGService:
     def _rerank(self, query: str, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """크로스인코더로 리랭킹"""
         try:
+            if not docs:
+                return docs
+            # 멀티쿼리 결과까지 합쳐 중복 제거된 후보 전체를 한 번의 forward로 채점
             pairs = [(query, d["content"]) for d in docs]
-            scores = self._cross_encoder.predict(pairs)
+            scores = np.asarray(
+                self._cross_encoder.predict(pairs, batch_size=max(32, len(pairs)), show_progress_bar=False),
+                dtype=np.float32
+            )
+            # 임계값 필터 + 내림차순 정렬 (벡터 연산)
+            keep = np.flatnonzero(scores >= self.settings.SIMILARITY_THRESHOLD)
+            order = keep[np.argsort(-scores[keep], kind="stable")][: self.settings.RERANK_TOP_K]
             scored = []
-            for doc, score in zip(docs, scores):
-                if score >= self.settings.SIMILARITY_THRESHOLD:
-                    doc["score"] = float(score)
-                    scored.append(doc)
-            scored.sort(key=lambda x: x["score"], reverse=True)
-            return scored[: self.settings.RERANK_TOP_K]
+            for i in order:
+                doc = docs[i]
+                doc["score"] = float(scores[i])
+                scored.append(doc)
+            return scored
         except Exception as e:
             logger.error(f"❌ 리랭킹 실패: {e}")
             return docs
 
 
 # 싱글톤 인스턴스
-_rag_service: RAGService = None
+_rag_service_instance: Optional[RAGService] = None
+_rag_service_lock = threading.Lock()
 
 
 def get_rag_service() -> RAGService:
-    """RAGService 싱글톤 반환"""
-    global _rag_service
-    if _rag_service is None:
-        _rag_service = RAGService()
-    return _rag_service
\ No newline at end of file
+    """RAGService 싱글톤 반환 (시작 시 워밍업 스레드와 요청 스레드가 동시에 호출해도 한 번만 생성)"""
+    global _rag_service_instance
+    
+    if _rag_service_instance is not None:
+        return _rag_service_instance
+    
+    with _rag_service_lock:
+        if _rag_service_instance is None:
+            _rag_service_instance = RAGService()
+    
+    return _rag_service_instance
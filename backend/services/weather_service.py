@@ -8,20 +8,61 @@ Weather Service
 
 from typing import Dict, Any, Optional
 from datetime import datetime
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import xml.etree.ElementTree as ET
 from utils.logger import logger
+from utils.ttl_cache import TTLCache
 from dotenv import load_dotenv
 from data.location import DONG_TO_CITY, LANDMARK_TO_CITY, UNIVERSITY_TO_CITY, KMA_LOCATION_CODES
 load_dotenv()
 
 try:
     from utils.config import get_settings
+    from utils.persistent_cache import get_persistent_cache
     HAS_CONFIG = True
 except ImportError:
     HAS_CONFIG = False
     logger.warning("config 모듈을 불러올 수 없습니다. Mock 모드로 동작합니다.")
 
+# 기상청 API Hub 엔드포인트 (동네예보)
+KMA_FORECAST_URL = "https://apihub.kma.go.kr/api/typ01/url/fct_afs_wl.php"
+
+# (연결, 응답) 타임아웃 (초) - 재시도 1회 포함 최악의 경우 2 × (2 + 3) = 10초 (재시도 도입 전 단일 요청 상한과 동일)
+_REQUEST_TIMEOUT = (2, 3)
+
+# 지점번호별 예보 응답 캐시 (예보는 수 시간 단위로 갱신 → 10분간 재사용)
+_FORECAST_CACHE_TTL = 600
+_forecast_cache = TTLCache(max_size=256, ttl=_FORECAST_CACHE_TTL)
+
+
+def _build_session() -> requests.Session:
+    """
+    기상청 API용 HTTP 세션 생성
+    
+    - keep-alive 커넥션 풀 재사용 (요청마다 TCP/TLS 핸드셰이크 생략)
+    - 일시적 오류(429/5xx, 연결 실패)는 1회 재시도 (첫 재시도는 백오프 없음)
+    - 응답 타임아웃은 재시도하지 않음 (답변 생성이 날씨 결과를 기다리므로 지연 상한 유지)
+    """
+    retry = Retry(
+        total=1,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=32)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = _build_session()
+
 def get_weather(location: str, target_date: Optional[str] = None) -> Dict[str, Any]:
     print(f"********Getting weather for location: {location}, target_date: {target_date}*************")
     """
@@ -60,7 +101,7 @@ def get_weather(location: str, target_date: Optional[str] = None) -> Dict[str, A
         stn_id = _extract_location_code(location)
         
         # 기상청 API Hub 호출 (동네예보 - 이미 활용신청 완료된 API)
-        url = "https://apihub.kma.go.kr/api/typ01/url/fct_afs_wl.php"
+        url = KMA_FORECAST_URL
         
         # 현재 시각 (정시 기준)
         now = datetime.now()
@@ -70,17 +111,39 @@ def get_weather(location: str, target_date: Optional[str] = None) -> Dict[str, A
             "authKey": api_key
         }
         
-        logger.info(f"[Weather] API 호출: {location} (stn={stn_id})")
-        logger.info(f"[Weather] Request URL: {url}")
-        logger.info(f"[Weather] Request Params: {params}")
-        
-        response = requests.get(url, params=params, timeout=10)
-        print(f"Response Status Code: {response.status_code}")
-        print(f"Response Text: {response.text[:500]}")  # 처음 500자만
-        response.raise_for_status()
+        # 같은 지점의 최근 응답이 있으면 API 호출 생략 (메모리 → 영속 캐시 순)
+        persistent = get_persistent_cache()
+        response_text = _forecast_cache.get(stn_id)
+        from_memory = response_text is not None
+        memory_ttl = _FORECAST_CACHE_TTL
+        if not from_memory and persistent is not None:
+            entry = persistent.get_with_ttl(f"weather:{stn_id}")
+            if entry is not None:
+                response_text, memory_ttl = entry
+        fetched = response_text is None
+        if not fetched:
+            logger.info(f"[Weather] 캐시 적중: {location} (stn={stn_id})")
+        else:
+            logger.info(f"[Weather] API 호출: {location} (stn={stn_id})")
+            logger.info(f"[Weather] Request URL: {url}")
+            logger.info(f"[Weather] Request Params: {params}")
+            
+            response = _session.get(url, params=params, timeout=_REQUEST_TIMEOUT)
+            print(f"Response Status Code: {response.status_code}")
+            print(f"Response Text: {response.text[:500]}")  # 처음 500자만
+            response.raise_for_status()
+            response_text = response.text
         
         # XML 파싱
-        weather_info = _parse_kma_xml_response(response.text, location)
+        weather_info = _parse_kma_xml_response(response_text, location)
+        
+        # 정상 파싱된 응답만 캐시 (오류 시 Mock 결과에는 "error" 포함)
+        # 영속 캐시에서 읽은 값은 남은 시간만큼만 메모리에 저장 → 원래 만료 시각 유지
+        if "error" not in weather_info:
+            if not from_memory:
+                _forecast_cache.set(stn_id, response_text, ttl=memory_ttl)
+            if persistent is not None and fetched:
+                persistent.set(f"weather:{stn_id}", response_text, _FORECAST_CACHE_TTL)
         
         logger.info(f"[Weather] 성공: {location} - {weather_info['description']}, {weather_info['temp']}°C")
         return weather_info
@@ -102,6 +165,7 @@ def get_weather(location: str, target_date: Optional[str] = None) -> Dict[str, A
         return _get_mock_weather(location, error=str(e))
 
 
+@lru_cache(maxsize=1024)
 def _extract_location_code(location: str) -> str:
     """
     입력된 위치에서 기상청 지점번호 추출 (개선판)
@@ -114,6 +178,8 @@ def _extract_location_code(location: str) -> str:
     5. KMA_LOCATION_CODES 부분 매칭
     6. 기본값: 서울
     
+    지역 테이블은 정적이므로 같은 입력은 캐시된 결과를 바로 반환합니다.
+    
     Args:
         location: "서울", "정자동", "해운대", "첨성대", "한강" 등
     
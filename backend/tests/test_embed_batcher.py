@@ -0,0 +1,59 @@
+"""EmbedBatcher 결과 분배/오류 전파 테스트"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.embed_batcher import EmbedBatcher
+
+
+def test_results_routed_to_each_caller():
+    batch_sizes = []
+
+    def encode(texts):
+        batch_sizes.append(len(texts))
+        return [[float(len(text)), float(ord(text[0]))] for text in texts]
+
+    batcher = EmbedBatcher(encode, max_batch_size=8, max_wait_ms=50)
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+    with ThreadPoolExecutor(max_workers=len(texts)) as pool:
+        results = list(pool.map(batcher.embed, texts))
+
+    assert results == [[float(len(t)), float(ord(t[0]))] for t in texts]
+    assert sum(batch_sizes) == len(texts)
+
+
+def test_row_count_mismatch_fails_every_caller():
+    batcher = EmbedBatcher(lambda texts: [[0.0]] * (len(texts) - 1), max_wait_ms=50)
+    errors = []
+
+    def call(text):
+        try:
+            batcher.embed(text)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call, args=(t,)) for t in ("a", "b", "c")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(errors) == 3
+
+
+def test_encode_error_propagates_and_worker_survives():
+    calls = []
+
+    def encode(texts):
+        calls.append(texts)
+        if len(calls) == 1:
+            raise ValueError("boom")
+        return [[1.0] for _ in texts]
+
+    batcher = EmbedBatcher(encode, max_wait_ms=1)
+    with pytest.raises(ValueError):
+        batcher.embed("a")
+    assert batcher.embed("b") == [1.0]
@@ -0,0 +1,32 @@
+"""LazyImport 지연 로딩 테스트"""
+
+import sys
+
+import pytest
+
+from utils.lazy import lazy_import
+
+
+def test_module_loaded_on_first_access():
+    sys.modules.pop("colorsys", None)
+    proxy = lazy_import("colorsys")
+
+    assert "colorsys" not in sys.modules
+    assert "not loaded" in repr(proxy)
+    assert proxy.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1)
+    assert "colorsys" in sys.modules
+
+
+def test_module_attribute_callable():
+    dumps = lazy_import("json.dumps")
+
+    assert dumps({"a": 1}) == '{"a": 1}'
+
+
+def test_missing_target_raises_on_use():
+    proxy = lazy_import("json.does_not_exist")
+
+    with pytest.raises(AttributeError):
+        proxy()
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("no_such_module_xyz")()
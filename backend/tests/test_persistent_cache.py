@@ -0,0 +1,53 @@
+"""PersistentCache(SQLite) 저장/조회/만료 테스트"""
+
+from types import SimpleNamespace
+
+from utils import persistent_cache
+from utils.persistent_cache import PersistentCache
+
+
+def _patch_clock(monkeypatch, start: float = 1_000_000.0) -> SimpleNamespace:
+    clock = SimpleNamespace(now=start)
+    monkeypatch.setattr(persistent_cache, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_round_trip(tmp_path):
+    cache = PersistentCache(str(tmp_path / "cache.db"))
+    value = [{"metadata": {"facility_name": "키즈카페", "lat": 37.5}}]
+    cache.set("rag:abc", value, ttl=60)
+
+    assert cache.get("rag:abc") == value
+    assert cache.get("rag:missing") is None
+
+
+def test_shared_between_connections(tmp_path):
+    path = str(tmp_path / "cache.db")
+    PersistentCache(path).set("weather:108", "<xml/>", ttl=60)
+
+    assert PersistentCache(path).get("weather:108") == "<xml/>"
+
+
+def test_expiry_and_remaining_ttl(tmp_path, monkeypatch):
+    clock = _patch_clock(monkeypatch)
+    cache = PersistentCache(str(tmp_path / "cache.db"))
+    cache.set("k", "v", ttl=100)
+
+    clock.now += 40
+    value, remaining = cache.get_with_ttl("k")
+    assert value == "v"
+    assert remaining == 60
+
+    clock.now += 61
+    assert cache.get("k") is None
+    assert cache.get_with_ttl("k") is None
+
+
+def test_overwrite_and_clear(tmp_path):
+    cache = PersistentCache(str(tmp_path / "cache.db"))
+    cache.set("k", 1, ttl=60)
+    cache.set("k", 2, ttl=60)
+    assert cache.get("k") == 2
+
+    cache.clear()
+    assert cache.get("k") is None
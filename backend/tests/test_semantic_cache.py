@@ -0,0 +1,82 @@
+"""SemanticCache / SemanticResultCache 태그 분리·유사도 매칭 테스트"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from utils import semantic_cache
+from utils.semantic_cache import SemanticCache, SemanticResultCache
+
+
+def _unit(*values: float) -> np.ndarray:
+    vec = np.asarray(values, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+# 정규화 쿼리 → 고정 임베딩 (실제 임베딩 모델 대신 사용)
+_VECTORS = {
+    "서울 실내 놀이터": _unit(1, 0, 0),
+    "서울 실내 놀이터 추천": _unit(0.99, 0.1, 0),
+    "부산 바다 체험": _unit(0, 1, 0),
+}
+
+
+def _cache(monkeypatch, ttl: float = 60, threshold: float = 0.95) -> SemanticCache:
+    monkeypatch.setattr(SemanticCache, "_embed", staticmethod(lambda query: _VECTORS[query]))
+    return SemanticCache(max_size=8, ttl=ttl, threshold=threshold)
+
+
+def test_exact_match_requires_same_tag(monkeypatch):
+    cache = _cache(monkeypatch)
+    cache.set("서울 실내 놀이터", {"answer": "today"}, ("서울", "today"))
+
+    assert cache.get("  서울   실내 놀이터 ", ("서울", "today")) == {"answer": "today"}
+    assert cache.get("서울 실내 놀이터", ("서울", "weekend")) is None
+
+
+def test_similar_query_matches_only_within_tag(monkeypatch):
+    cache = _cache(monkeypatch)
+    cache.set("서울 실내 놀이터", {"answer": "seoul"}, ("서울", None))
+    cache.set("부산 바다 체험", {"answer": "busan"}, ("부산", None))
+
+    assert cache.get("서울 실내 놀이터 추천", ("서울", None)) == {"answer": "seoul"}
+    assert cache.get("서울 실내 놀이터 추천", ("부산", None)) is None
+
+
+def test_dissimilar_query_misses(monkeypatch):
+    cache = _cache(monkeypatch)
+    cache.set("서울 실내 놀이터", {"answer": "seoul"}, None)
+
+    assert cache.get("부산 바다 체험", None) is None
+
+
+def test_entries_expire(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(semantic_cache, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    cache = _cache(monkeypatch, ttl=60)
+    cache.set("서울 실내 놀이터", {"answer": "seoul"}, None)
+
+    clock.now = 61
+    assert cache.get("서울 실내 놀이터", None) is None
+
+
+def test_result_cache_tag_isolation():
+    cache = SemanticResultCache(max_size=4, ttl=60, threshold=0.95)
+    cache.set(_unit(1, 0, 0), "filters-a", ["a"])
+    cache.set(_unit(1, 0, 0), "filters-b", ["b"])
+
+    assert cache.get(_unit(0.99, 0.1, 0), "filters-a") == ["a"]
+    assert cache.get(_unit(0.99, 0.1, 0), "filters-b") == ["b"]
+    assert cache.get(_unit(1, 0, 0), "filters-c") is None
+    assert cache.get(_unit(0, 1, 0), "filters-a") is None
+
+
+def test_result_cache_overwrites_oldest_slot():
+    cache = SemanticResultCache(max_size=2, ttl=60, threshold=0.95)
+    cache.set(_unit(1, 0, 0), "t", "first")
+    cache.set(_unit(0, 1, 0), "t", "second")
+    cache.set(_unit(0, 0, 1), "t", "third")
+
+    assert cache.get(_unit(1, 0, 0), "t") is None
+    assert cache.get(_unit(0, 1, 0), "t") == "second"
+    assert cache.get(_unit(0, 0, 1), "t") == "third"
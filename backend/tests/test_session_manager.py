@@ -0,0 +1,118 @@
+"""세션 히스토리 LRU 상한 / 정리(compaction) / Redis 저장소 테스트"""
+
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from utils import session_manager
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    settings = SimpleNamespace(SESSION_CACHE_SIZE=2, SESSION_MAX_MESSAGES=4, SESSION_TTL=60, REDIS_URL=None)
+    monkeypatch.setattr(session_manager, "get_settings", lambda: settings)
+    monkeypatch.setattr(session_manager, "_sessions", type(session_manager._sessions)())
+    monkeypatch.setattr(session_manager, "_location_cache", {})
+    monkeypatch.setattr(session_manager, "_redis_client", None)
+    monkeypatch.setattr(session_manager, "_redis_checked", True)
+    return settings
+
+
+@pytest.fixture
+def fake_redis(monkeypatch, settings):
+    client = FakeRedis()
+    monkeypatch.setattr(session_manager, "_redis_client", client)
+    return client
+
+
+def _messages(n: int):
+    return [{"role": "user" if i % 2 == 0 else "ai", "content": f"msg {i}"} for i in range(n)]
+
+
+def test_compaction_keeps_recent_messages(settings):
+    session_manager.save_history("c1", _messages(6))
+
+    history = session_manager.get_history("c1")
+    assert [m["content"] for m in history] == ["msg 2", "msg 3", "msg 4", "msg 5"]
+
+
+def test_short_strings_are_interned(settings):
+    first = [{"role": "".join(["us", "er"]), "content": "".join(["고마", "워"])}]
+    second = [{"role": "".join(["us", "er"]), "content": "".join(["고마", "워"])}]
+    session_manager.save_history("c1", first)
+    session_manager.save_history("c2", second)
+
+    a = session_manager.get_history("c1")[0]
+    b = session_manager.get_history("c2")[0]
+    assert a["role"] is b["role"]
+    assert a["content"] is b["content"]
+
+
+def test_session_cap_evicts_least_recent(settings):
+    session_manager.save_history("c1", _messages(1))
+    session_manager.save_cached_location("c1", "서울")
+    session_manager.save_history("c2", _messages(1))
+    session_manager.get_history("c1")  # c1이 최근 사용됨 → c2가 제거 대상
+    session_manager.save_history("c3", _messages(1))
+
+    assert session_manager.get_session_count() == 2
+    assert session_manager.get_history("c2") == []
+    assert session_manager.get_history("c1") != []
+    assert session_manager.get_cached_location("c1") == "서울"
+
+
+def test_evicted_session_drops_cached_location(settings):
+    session_manager.save_history("c1", _messages(1))
+    session_manager.save_cached_location("c1", "부산")
+    session_manager.save_history("c2", _messages(1))
+    session_manager.save_history("c3", _messages(1))
+
+    assert session_manager.get_cached_location("c1") is None
+
+
+def test_redis_restores_evicted_session(fake_redis):
+    session_manager.save_history("c1", _messages(2))
+    assert orjson.loads(fake_redis.store["conv:c1"]) == _messages(2)
+
+    session_manager.save_history("c2", _messages(1))
+    session_manager.save_history("c3", _messages(1))
+    assert "c1" not in session_manager._sessions
+
+    assert session_manager.get_history("c1") == _messages(2)
+    assert "c1" in session_manager._sessions
+
+
+def test_async_history_round_trip(fake_redis):
+    async def scenario():
+        await session_manager.asave_history("c1", _messages(3))
+        await asyncio.gather(*session_manager._pending_writes)
+        session_manager._sessions.clear()
+        return await session_manager.aget_history("c1")
+
+    assert asyncio.run(scenario()) == _messages(3)
+
+
+def test_clear_history_removes_everywhere(fake_redis):
+    session_manager.save_history("c1", _messages(1))
+    session_manager.save_cached_location("c1", "서울")
+    session_manager.clear_history("c1")
+
+    assert session_manager.get_history("c1") == []
+    assert session_manager.get_cached_location("c1") is None
+    assert "conv:c1" not in fake_redis.store
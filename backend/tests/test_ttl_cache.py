@@ -0,0 +1,74 @@
+"""TTLCache 만료/LRU 제거 테스트"""
+
+from types import SimpleNamespace
+
+from utils import ttl_cache
+from utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def _patch_clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def test_get_returns_value_until_ttl(monkeypatch):
+    clock = _patch_clock(monkeypatch)
+    cache = TTLCache(max_size=4, ttl=10)
+    cache.set("a", 1)
+
+    clock.now += 10
+    assert cache.get("a") == 1
+
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default(monkeypatch):
+    clock = _patch_clock(monkeypatch)
+    cache = TTLCache(max_size=4, ttl=600)
+    cache.set("short", "x", ttl=5)
+    cache.set("long", "y")
+
+    clock.now += 6
+    assert cache.get("short") is None
+    assert cache.get("long") == "y"
+
+
+def test_lru_eviction_keeps_recently_used(monkeypatch):
+    _patch_clock(monkeypatch)
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a가 최근 사용됨 → b가 제거 대상
+
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_set_overwrites_and_refreshes_expiry(monkeypatch):
+    clock = _patch_clock(monkeypatch)
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    clock.now += 8
+    cache.set("a", 2)
+    clock.now += 8
+    assert cache.get("a") == 2
+
+
+def test_clear():
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    cache.clear()
+    assert cache.get("a") is None
@@ -4,6 +4,9 @@ utils 패키지: 공통 유틸리티 모듈 모음
 - config.py
 - logger.py
 - vector_client.py
+- lazy.py
+- ttl_cache.py
+- persistent_cache.py
 """
 
-__all__ = ["get_settings", "logger", "get_vector_client"]
\ No newline at end of file
+__all__ = ["get_settings", "logger", "get_vector_client", "lazy_import", "TTLCache"]
\ No newline at end of file
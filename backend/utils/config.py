@@ -17,6 +17,9 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str = "Alibaba-NLP/gte-Qwen2-7B-instruct"
     GENERATION_MODEL: str = "Qwen/Qwen2.5-7B-Instruct"
     RERANKER_MODEL: str = "BAAI/bge-reranker-v2-m3"
+    LLM_QUANTIZATION: Optional[str] = None  # "4bit" | "8bit" (bitsandbytes, GPU 전용 / 미설정 시 FP16)
+    LLM_SERVER_URL: Optional[str] = None  # OpenAI 호환 생성 서버 (예: vLLM "http://vllm:8000", prefix caching 활성화 권장)
+    LLM_LOCAL_FALLBACK: bool = False  # LLM_SERVER_URL 사용 시에도 로컬 GPU 모델을 대체용으로 로드할지 여부
     
     # Vector DB - 로컬/클라우드 자동 감지
     # 로컬 ChromaDB (Docker Compose)
@@ -37,16 +40,48 @@ class Settings(BaseSettings):
     MMR_DIVERSITY: float = 0.3  # MMR 다양성 (0~1)
     MMR_TOP_K: int = 5  # MMR 최종 결과 개수
     SIMILARITY_THRESHOLD: float = 0.3  # 유사도 임계값
+    PREFILTER_SELECTIVITY_THRESHOLD: int = 60  # 필터 후보가 이 수 이하이면 후보 ID 안에서만 검색 (0: 비활성)
+    
+    # Embedding Settings (GPU 쿼리 임베딩 배치 처리)
+    EMBED_BATCH_SIZE: int = 32  # 한 번에 묶을 최대 쿼리 수
+    EMBED_BATCH_WAIT_MS: float = 10.0  # 요청을 모으는 최대 대기 시간 (ms)
     
     # Multi-Query Settings
     MULTI_QUERY_ENABLED: bool = True
     NUM_SUB_QUERIES: int = 3
     
+    # Session Store
+    REDIS_URL: Optional[str] = None  # 예: "redis://localhost:6379/0" (미설정 시 메모리만 사용)
+    SESSION_CACHE_SIZE: int = 1024  # 메모리 LRU에 유지할 대화 수
+    SESSION_TTL: int = 60 * 60 * 24  # Redis 히스토리 유지 시간 (초)
+    SESSION_MAX_MESSAGES: int = 50  # 대화당 보관할 최근 메시지 수 (Agent는 최근 10개만 참조)
+    
+    # Semantic Cache Settings (반복 질문 응답 캐시)
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_SIZE: int = 256  # 최대 캐시 항목 수
+    SEMANTIC_CACHE_TTL: int = 60  # 캐시 유지 시간 (초, 날씨가 포함된 답변이므로 AGENT_CACHE_TTL과 같게)
+    SEMANTIC_CACHE_THRESHOLD: float = 0.97  # 코사인 유사도 임계값
+    
+    # RAG Result Cache (유사 쿼리의 검색·리랭킹 결과 재사용)
+    RAG_CACHE_ENABLED: bool = True
+    RAG_CACHE_SIZE: int = 512  # 최대 캐시 항목 수 (임베딩 행렬 행 수)
+    RAG_CACHE_TTL: int = 1800  # 캐시 유지 시간 (초)
+    RAG_CACHE_THRESHOLD: float = 0.95  # 코사인 유사도 임계값
+    
+    # Agent Response Cache (동일 질문·지역·날짜 정확 매칭)
+    AGENT_CACHE_ENABLED: bool = True
+    AGENT_CACHE_SIZE: int = 1024  # 최대 캐시 항목 수
+    AGENT_CACHE_TTL: int = 60  # 캐시 유지 시간 (초, 날씨가 포함된 답변이므로 짧게)
+    
+    # Persistent Result Cache (RAG 검색·날씨 응답을 워커 재시작/다중 워커 간 공유)
+    RESULT_CACHE_PATH: Optional[str] = None  # SQLite 파일 경로 (예: "./cache/results.db", 미설정 시 비활성)
+    
     # 실행 환경
     ENVIRONMENT: str = "local"  # local, docker, colab, runpod
     USE_GPU: bool = False  # GPU 사용 여부
     
     # Server
+    WARMUP_ON_STARTUP: bool = True  # 시작 시 VectorDB/RAG/LLM 싱글톤 미리 생성
     DEBUG: bool = True
     PORT: int = 3001
     
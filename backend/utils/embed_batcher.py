@@ -0,0 +1,75 @@
+# utils/embed_batcher.py
+"""
+Embedding Request Coalescer
+
+여러 스레드에서 동시에 들어온 단건 임베딩 요청을 짧은 시간 창(기본 10ms) 동안 모아
+한 번의 배치 encode 호출로 처리합니다. (GPU 배치 GEMM 효율 회복)
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Sequence
+
+import numpy as np
+
+from utils.logger import logger
+
+
+class EmbedBatcher:
+    """단건 임베딩 요청을 배치로 묶어 처리하는 백그라운드 워커"""
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], Sequence],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 10.0
+    ) -> None:
+        self._encode_fn = encode_fn
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="embed-batcher", daemon=True)
+        self._worker.start()
+
+    def embed(self, text: str) -> List[float]:
+        """텍스트 하나를 임베딩 (배치 처리 완료까지 대기)"""
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def _collect(self) -> List[tuple]:
+        """첫 요청 이후 max_wait 동안 최대 max_batch_size개까지 모음"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self._max_wait
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            texts = [text for text, _ in batch]
+            error: BaseException = RuntimeError("임베딩 배치 결과 누락")
+            try:
+                vectors = self._encode_fn(texts)
+                if len(vectors) != len(batch):
+                    raise RuntimeError(f"임베딩 결과 개수 불일치: {len(vectors)}개 (요청 {len(batch)}건)")
+                for (_, future), vector in zip(batch, vectors):
+                    future.set_result(np.asarray(vector, dtype=np.float32).tolist())
+                if len(batch) > 1:
+                    logger.debug(f"🧮 임베딩 배치 처리: {len(batch)}건")
+            except Exception as e:
+                error = e
+            finally:
+                # 결과를 받지 못한 요청은 모두 예외로 완료 (호출 스레드가 영원히 대기하지 않도록)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
@@ -0,0 +1,59 @@
+# utils/lazy.py
+"""
+Lazy Import 유틸리티
+
+무거운 모듈(LangChain, torch 등)을 처음 사용하는 시점까지 import를 미뤄
+서버 cold-start 시간을 줄입니다.
+"""
+
+import importlib
+import threading
+from typing import Any
+
+
+class LazyImport:
+    """
+    첫 접근 시점에 import 되는 프록시 객체
+
+    - 모듈 경로: lazy_import("services.agent_service")
+    - 모듈 속성: lazy_import("services.agent_service.run_agent")
+    """
+
+    def __init__(self, target: str) -> None:
+        self._target = target
+        self._obj = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Any:
+        """대상을 import 후 캐시"""
+        if self._obj is None:
+            with self._lock:
+                if self._obj is None:
+                    self._obj = self._resolve(self._target)
+        return self._obj
+
+    @staticmethod
+    def _resolve(target: str) -> Any:
+        try:
+            return importlib.import_module(target)
+        except ModuleNotFoundError as e:
+            # 모듈이 아니면 "모듈.속성" 형태로 해석
+            module_name, _, attr = target.rpartition(".")
+            if not module_name or e.name != target:
+                raise
+            return getattr(importlib.import_module(module_name), attr)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._obj is not None else "not loaded"
+        return f"<LazyImport '{self._target}' ({state})>"
+
+
+def lazy_import(target: str) -> LazyImport:
+    """모듈 또는 모듈 속성에 대한 lazy 프록시 반환"""
+    return LazyImport(target)
@@ -0,0 +1,93 @@
+# utils/persistent_cache.py
+"""
+SQLite 기반 영속 결과 캐시
+
+인메모리 TTLCache 뒤에 두는 2차 캐시로, RAG 검색/날씨 응답을
+워커 재시작 후에도, 같은 호스트의 여러 Uvicorn 워커 사이에서도 재사용합니다.
+RESULT_CACHE_PATH 미설정 시 비활성화됩니다.
+"""
+
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+import orjson
+
+from utils.config import get_settings
+from utils.logger import logger
+
+
+class PersistentCache:
+    """key → orjson 직렬화 값을 만료 시각과 함께 저장하는 SQLite 캐시"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            # WAL: 여러 워커가 동시에 읽어도 쓰기와 서로 막지 않음
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS result_cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            # 시작 시 만료된 항목 정리
+            self._conn.execute("DELETE FROM result_cache WHERE expires_at < ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되었거나 오류 시 None)"""
+        entry = self.get_with_ttl(key)
+        return None if entry is None else entry[0]
+
+    def get_with_ttl(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        캐시 조회 + 남은 유지 시간(초)
+        
+        메모리 캐시로 옮길 때 남은 시간만 주어 원래 만료 시각을 넘기지 않도록 사용
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM result_cache WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 영속 캐시 조회 실패: {e}")
+            return None
+        remaining = row[1] - time.time() if row is not None else 0
+        if remaining <= 0:
+            return None
+        return orjson.loads(row[0]), remaining
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """캐시 저장 (같은 key는 덮어씀, 실패해도 요청 처리에는 영향 없음)"""
+        try:
+            blob = orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO result_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, blob, time.time() + ttl)
+                )
+        except (sqlite3.Error, TypeError) as e:
+            logger.warning(f"⚠️ 영속 캐시 저장 실패: {e}")
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM result_cache")
+
+
+@lru_cache(maxsize=1)
+def get_persistent_cache() -> Optional[PersistentCache]:
+    """PersistentCache 싱글톤 반환 (RESULT_CACHE_PATH 미설정/열기 실패 시 None)"""
+    path = get_settings().RESULT_CACHE_PATH
+    if not path:
+        return None
+    try:
+        cache = PersistentCache(path)
+    except sqlite3.Error as e:
+        logger.error(f"❌ 영속 캐시 열기 실패: {e} → 메모리 캐시만 사용")
+        return None
+    logger.info(f"✅ 영속 결과 캐시 사용: {path}")
+    return cache
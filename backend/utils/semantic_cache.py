@@ -0,0 +1,171 @@
+# utils/semantic_cache.py
+"""
+Semantic Response Cache
+
+자주 반복되는 질문(예: "서울 실내 놀이터")에 대해
+Agent(RAG + LLM) 실행 없이 이전 응답을 재사용합니다.
+
+- 정규화된 쿼리 정확 매칭 → 임베딩 코사인 유사도 매칭 순으로 조회
+- 태그(예: 위치·날짜)가 같은 항목끼리만 매칭 (문장이 비슷해도 다른 도시/날짜 응답은 재사용 안 함)
+- LRU + TTL 기반 만료
+
+SemanticResultCache는 RAG 검색 결과용으로, 사전 할당한 임베딩 행렬에
+FIFO(링 버퍼)로 저장하고 한 번의 행렬-벡터 곱으로 조회합니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from utils.config import get_settings
+from utils.logger import logger
+
+
+class SemanticCache:
+    """쿼리 임베딩 기반 응답 캐시"""
+
+    def __init__(self, max_size: int, ttl: float, threshold: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        # 정규화 쿼리 → (임베딩, payload, 저장 시각, 태그)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        """공백/대소문자 정규화"""
+        return " ".join(query.lower().split())
+
+    @staticmethod
+    def _embed(query: str) -> np.ndarray:
+        """RAG 검색과 동일한 임베딩 모델로 쿼리 임베딩 (L2 정규화)"""
+        from utils.vector_client import get_vector_client
+
+        vec = np.asarray(get_vector_client().encode_query(query), dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def _evict_expired(self, now: float) -> None:
+        expired = [k for k, (_, _, ts, _) in self._entries.items() if now - ts > self.ttl]
+        for key in expired:
+            del self._entries[key]
+
+    def get(self, query: str, tag: Hashable = None) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (태그가 같은 항목만, 없으면 None)"""
+        key = self._normalize(query)
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._entries.get(key)
+            if entry is not None and entry[3] == tag:
+                self._entries.move_to_end(key)
+                logger.info(f"⚡ 캐시 적중 (정확 매칭): '{key}'")
+                return entry[1]
+            keys = [k for k, entry in self._entries.items() if entry[3] == tag]
+            if not keys:
+                return None
+            matrix = np.stack([self._entries[k][0] for k in keys])
+
+        query_vec = self._embed(key)
+        scores = matrix @ query_vec
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(keys[best])
+            if entry is None or entry[3] != tag:
+                return None
+            self._entries.move_to_end(keys[best])
+        logger.info(f"⚡ 캐시 적중 (유사도 {scores[best]:.4f}): '{key}' ≈ '{keys[best]}'")
+        return entry[1]
+
+    def set(self, query: str, payload: Dict[str, Any], tag: Hashable = None) -> None:
+        """캐시 저장"""
+        key = self._normalize(query)
+        vec = self._embed(key)
+
+        with self._lock:
+            self._entries[key] = (vec, payload, time.monotonic(), tag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SemanticResultCache:
+    """
+    임베딩 유사도 기반 검색 결과 캐시 (고정 크기 링 버퍼)
+
+    - 임베딩 행렬 E [max_size, dim] (float32)를 첫 저장 시 한 번만 할당
+    - 조회: scores = E @ q 한 번 계산 후, 태그(필터 등)가 같고 만료되지 않은 항목 중 최고점
+    - 저장: 가장 오래된 슬롯부터 덮어쓰기 (FIFO)
+    """
+
+    def __init__(self, max_size: int, ttl: float, threshold: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        self._matrix: Optional[np.ndarray] = None
+        self._tag_hashes = np.zeros(max_size, dtype=np.int64)
+        self._timestamps = np.zeros(max_size, dtype=np.float64)
+        self._tags: List[Optional[Hashable]] = [None] * max_size
+        self._values: List[Any] = [None] * max_size
+        self._count = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def get(self, query_vec: np.ndarray, tag: Hashable) -> Optional[Any]:
+        """L2 정규화된 쿼리 벡터와 태그로 조회 (없으면 None)"""
+        with self._lock:
+            if self._count == 0:
+                return None
+            n = self._count
+            scores = self._matrix[:n] @ query_vec
+            valid = (self._tag_hashes[:n] == hash(tag)) & (time.monotonic() - self._timestamps[:n] <= self.ttl)
+            scores = np.where(valid, scores, -np.inf)
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold or self._tags[best] != tag:
+                return None
+            return self._values[best]
+
+    def set(self, query_vec: np.ndarray, tag: Hashable, value: Any) -> None:
+        """결과 저장 (가득 차면 가장 오래된 항목을 덮어씀)"""
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.max_size, query_vec.shape[0]), dtype=np.float32)
+            slot = self._next
+            self._matrix[slot] = query_vec
+            self._tag_hashes[slot] = hash(tag)
+            self._timestamps[slot] = time.monotonic()
+            self._tags[slot] = tag
+            self._values[slot] = value
+            self._next = (slot + 1) % self.max_size
+            self._count = min(self._count + 1, self.max_size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._count = 0
+            self._next = 0
+            self._tags = [None] * self.max_size
+            self._values = [None] * self.max_size
+
+
+@lru_cache(maxsize=1)
+def get_semantic_cache() -> SemanticCache:
+    """SemanticCache 싱글톤 반환"""
+    settings = get_settings()
+    return SemanticCache(
+        max_size=settings.SEMANTIC_CACHE_SIZE,
+        ttl=settings.SEMANTIC_CACHE_TTL,
+        threshold=settings.SEMANTIC_CACHE_THRESHOLD
+    )
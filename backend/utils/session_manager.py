@@ -4,19 +4,126 @@ Session History Manager
 
 대화 히스토리를 메모리에 저장하고 관리합니다.
 conversation_id 기반으로 멀티턴 대화를 지원합니다.
+
+- 1차 저장소: 프로세스 내 LRU (최근 대화 SESSION_CACHE_SIZE개 유지)
+- 2차 저장소: Redis (REDIS_URL 설정 시, orjson 직렬화 + TTL)
+- 대화당 최근 SESSION_MAX_MESSAGES개만 보관, 반복되는 role/짧은 문구는 intern
 """
 
-from typing import Dict, List, Optional
+import asyncio
+import sys
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+import orjson
+
+from utils.config import get_settings
 from utils.logger import logger
 
+# Redis 라이브러리 import 시도 (선택 의존성)
+try:
+    import redis
+except ImportError:
+    redis = None
 
-# 전역 세션 저장소 (In-memory)
-# 실제 배포 시에는 Redis 등으로 교체 권장
-_sessions: Dict[str, List[Dict[str, str]]] = {}
+
+# 전역 세션 저장소 (In-memory LRU)
+_sessions: "OrderedDict[str, List[Dict[str, str]]]" = OrderedDict()
 
 # 위치 정보 캐시 (대화별)
 _location_cache: Dict[str, str] = {}
 
+# 진행 중인 Redis 백그라운드 저장 작업 (GC 방지용 참조)
+_pending_writes: Set[asyncio.Task] = set()
+
+_REDIS_KEY_PREFIX = "conv:"
+_redis_client = None
+_redis_checked = False
+
+
+def _get_redis():
+    """Redis 클라이언트 반환 (REDIS_URL 미설정/미설치 시 None)"""
+    global _redis_client, _redis_checked
+    if _redis_checked:
+        return _redis_client
+    
+    _redis_checked = True
+    url = get_settings().REDIS_URL
+    if not url:
+        return None
+    if redis is None:
+        logger.warning("⚠️ REDIS_URL이 설정되었지만 redis 패키지가 없습니다 → 메모리 저장소만 사용")
+        return None
+    
+    try:
+        _redis_client = redis.Redis.from_url(url)
+        _redis_client.ping()
+        logger.info(f"✅ Redis 세션 저장소 연결: {url}")
+    except Exception as e:
+        logger.error(f"❌ Redis 연결 실패: {e} → 메모리 저장소만 사용")
+        _redis_client = None
+    return _redis_client
+
+
+# 이 길이 이하의 메시지는 intern ("고마워", 지역명 등 반복 문구를 대화 간 공유)
+_INTERN_MAX_LEN = 32
+
+
+def _compact(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    저장 전 히스토리 정리
+    
+    - 최근 SESSION_MAX_MESSAGES개만 유지 (턴마다 복사·직렬화 비용 상한)
+    - role과 짧은 content 문자열을 intern (Redis에서 읽은 사본도 같은 객체 공유)
+    """
+    max_messages = get_settings().SESSION_MAX_MESSAGES
+    if max_messages and len(messages) > max_messages:
+        messages = messages[-max_messages:]
+    
+    for msg in messages:
+        msg["role"] = sys.intern(msg["role"])
+        content = msg.get("content")
+        if isinstance(content, str) and len(content) <= _INTERN_MAX_LEN:
+            msg["content"] = sys.intern(content)
+    return messages
+
+
+def _cache_put(conversation_id: str, messages: List[Dict[str, str]]):
+    """메모리 LRU에 저장 (용량 초과 시 가장 오래된 대화 제거)"""
+    _sessions[conversation_id] = messages
+    _sessions.move_to_end(conversation_id)
+    
+    max_size = get_settings().SESSION_CACHE_SIZE
+    while len(_sessions) > max_size:
+        evicted, _ = _sessions.popitem(last=False)
+        _location_cache.pop(evicted, None)
+
+
+def _redis_get(conversation_id: str) -> Optional[List[Dict[str, str]]]:
+    client = _get_redis()
+    if client is None:
+        return None
+    try:
+        raw = client.get(_REDIS_KEY_PREFIX + conversation_id)
+        return _compact(orjson.loads(raw)) if raw else None
+    except Exception as e:
+        logger.error(f"❌ Redis 히스토리 조회 실패: {e}")
+        return None
+
+
+def _redis_set(conversation_id: str, messages: List[Dict[str, str]]):
+    client = _get_redis()
+    if client is None:
+        return
+    try:
+        client.set(
+            _REDIS_KEY_PREFIX + conversation_id,
+            orjson.dumps(messages),
+            ex=get_settings().SESSION_TTL
+        )
+    except Exception as e:
+        logger.error(f"❌ Redis 히스토리 저장 실패: {e}")
+
 
 def get_history(conversation_id: str) -> List[Dict[str, str]]:
     """
@@ -28,7 +135,15 @@ def get_history(conversation_id: str) -> List[Dict[str, str]]:
     Returns:
         메시지 리스트: [{"role": "user", "content": "..."}, ...]
     """
-    history = _sessions.get(conversation_id, [])
+    history = _sessions.get(conversation_id)
+    if history is not None:
+        _sessions.move_to_end(conversation_id)
+    else:
+        history = _redis_get(conversation_id)
+        if history is None:
+            return []
+        _cache_put(conversation_id, history)
+    
     logger.debug(f"📜 히스토리 조회: {conversation_id} ({len(history)}개 메시지)")
     return history
 
@@ -41,10 +156,48 @@ def save_history(conversation_id: str, messages: List[Dict[str, str]]):
         conversation_id: 대화 세션 ID
         messages: 저장할 메시지 리스트
     """
-    _sessions[conversation_id] = messages
+    messages = _compact(messages)
+    _cache_put(conversation_id, messages)
+    _redis_set(conversation_id, messages)
     logger.debug(f"💾 히스토리 저장: {conversation_id} ({len(messages)}개 메시지)")
 
 
+async def aget_history(conversation_id: str) -> List[Dict[str, str]]:
+    """
+    대화 히스토리 조회 (async 핸들러용)
+    
+    메모리 LRU 적중 시 바로 반환, 미스일 때만 워커 스레드에서 Redis 조회
+    """
+    history = _sessions.get(conversation_id)
+    if history is not None:
+        _sessions.move_to_end(conversation_id)
+        return history
+    if _get_redis() is None:
+        return []
+    
+    history = await asyncio.to_thread(_redis_get, conversation_id)
+    if history is None:
+        return []
+    _cache_put(conversation_id, history)
+    return history
+
+
+async def asave_history(conversation_id: str, messages: List[Dict[str, str]]):
+    """
+    대화 히스토리 저장 (async 핸들러용)
+    
+    메모리 LRU는 즉시 갱신하고, Redis 쓰기는 백그라운드로 실행해 응답을 막지 않음
+    """
+    messages = _compact(messages)
+    _cache_put(conversation_id, messages)
+    if _get_redis() is None:
+        return
+    
+    task = asyncio.create_task(asyncio.to_thread(_redis_set, conversation_id, messages))
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+
+
 def add_message(conversation_id: str, role: str, content: str):
     """
     메시지 추가
@@ -72,6 +225,13 @@ def clear_history(conversation_id: str):
     
     if conversation_id in _location_cache:
         del _location_cache[conversation_id]
+    
+    client = _get_redis()
+    if client is not None:
+        try:
+            client.delete(_REDIS_KEY_PREFIX + conversation_id)
+        except Exception as e:
+            logger.error(f"❌ Redis 히스토리 삭제 실패: {e}")
 
 
 def get_cached_location(conversation_id: str) -> Optional[str]:
@@ -100,7 +260,7 @@ def save_cached_location(conversation_id: str, location: str):
 
 
 def get_session_count() -> int:
-    """활성 세션 개수 반환"""
+    """활성 세션 개수 반환 (메모리 LRU 기준)"""
     return len(_sessions)
 
 
@@ -113,8 +273,10 @@ def cleanup_old_sessions(max_sessions: int = 100):
     """
     if len(_sessions) > max_sessions:
         # 가장 오래된 세션부터 삭제
+        # (메모리에서만 제거, Redis 사본은 TTL까지 유지)
         sessions_to_delete = list(_sessions.keys())[:-max_sessions]
         for session_id in sessions_to_delete:
-            clear_history(session_id)
+            _sessions.pop(session_id, None)
+            _location_cache.pop(session_id, None)
         
-        logger.info(f"🧹 오래된 세션 정리: {len(sessions_to_delete)}개 삭제")
\ No newline at end of file
+        logger.info(f"🧹 오래된 세션 정리: {len(sessions_to_delete)}개 삭제")
@@ -0,0 +1,55 @@
+# utils/ttl_cache.py
+"""
+TTL + LRU 인메모리 캐시
+
+날씨/RAG/Agent 결과처럼 짧은 시간 동안 재사용 가능한 값을 저장합니다.
+여러 스레드(FastAPI 스레드풀, 도구 실행 풀)에서 동시에 접근해도 안전합니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """최대 크기(LRU)와 유지 시간(TTL)을 가진 스레드 안전 캐시"""
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        # key → (value, 만료 시각)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() > expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        캐시 저장 (가장 오래 사용하지 않은 항목부터 제거)
+        
+        ttl: 항목별 유지 시간 (다른 캐시에서 옮겨올 때 남은 시간 전달, 기본값 self.ttl)
+        """
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -7,12 +7,15 @@ Docker Compose 환경에서 chromadb 서비스와 연결
 
 import os
 import hashlib
-from typing import List, Dict, Any, Optional
+import threading
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 
 import chromadb
 import numpy as np
 
 from utils.config import get_settings
+from utils.embed_batcher import EmbedBatcher
 from utils.logger import logger
 
 
@@ -24,8 +27,12 @@ class VectorClient:
         self.client = None
         self.collection = None
         self._embedding_model = None
+        self._embed_batcher = None
         self._is_gpu_environment = self._detect_environment()
         
+        # 쿼리 임베딩 캐시 (반복 쿼리는 모델 호출 생략, 실제 모델 결과만 저장)
+        self._encode_query_cached = lru_cache(maxsize=1024)(self._encode_query_uncached)
+        
         # ChromaDB 연결 (로컬 우선)
         self._connect()
         
@@ -123,9 +130,31 @@ class VectorClient:
             
             logger.info(f"🔄 임베딩 모델 로딩 중: {self.settings.EMBEDDING_MODEL}")
             
+            device = 'cuda' if self._is_gpu_environment else 'cpu'
             self._embedding_model = SentenceTransformer(
                 self.settings.EMBEDDING_MODEL,
-                device='cuda' if self._is_gpu_environment else 'cpu'
+                device=device
+            )
+            
+            # GPU에서는 FP16으로 상주 (메모리 대역폭 절반, 텐서코어 활용)
+            if device == 'cuda':
+                try:
+                    import torch
+                    if torch.cuda.is_available():
+                        self._embedding_model = self._embedding_model.half()
+                except ImportError:
+                    pass
+            
+            # 동시 쿼리 임베딩 요청을 배치로 묶는 코얼레서
+            self._embed_batcher = EmbedBatcher(
+                lambda texts: self._embedding_model.encode(
+                    texts,
+                    batch_size=len(texts),
+                    convert_to_numpy=True,
+                    show_progress_bar=False
+                ),
+                max_batch_size=self.settings.EMBED_BATCH_SIZE,
+                max_wait_ms=self.settings.EMBED_BATCH_WAIT_MS
             )
             
             logger.info("✅ 임베딩 모델 로드 완료")
@@ -135,15 +164,17 @@ class VectorClient:
             logger.warning("Mock 임베딩으로 대체합니다")
             self._is_gpu_environment = False
             self._embedding_model = None
+            self._embed_batcher = None
     
     def search(
         self,
         query_text: str,
         n_results: int = 10,
         where: Optional[Dict[str, Any]] = None,
-        where_document: Optional[Dict[str, Any]] = None
+        where_document: Optional[Dict[str, Any]] = None,
+        ids: Optional[List[str]] = None
     ) -> Dict[str, Any]:
-        """벡터 검색"""
+        """벡터 검색 (ids 지정 시 해당 후보 문서 안에서만 검색)"""
         try:
             env_status = "GPU" if self._is_gpu_environment else "Mock"
             logger.info(f"🔍 검색 쿼리: '{query_text}' (n_results={n_results}, 환경={env_status})")
@@ -152,15 +183,19 @@ class VectorClient:
                 logger.info(f"   메타데이터 필터: {where}")
             
             # 쿼리 임베딩
-            query_embedding = self._encode_query(query_text)
+            query_embedding = self.encode_query(query_text)
             
             # ChromaDB 검색
+            query_kwargs = {}
+            if ids is not None:
+                query_kwargs["ids"] = ids
             results = self.collection.query(
                 query_embeddings=[query_embedding],
                 n_results=n_results,
                 where=where,
                 where_document=where_document,
-                include=["documents", "metadatas", "distances"]
+                include=["documents", "metadatas", "distances"],
+                **query_kwargs
             )
             
             logger.info(f"✅ 검색 완료: {len(results['ids'][0])}개 결과")
@@ -175,24 +210,39 @@ class VectorClient:
             logger.error(f"❌ 검색 실패: {e}")
             raise
     
-    def _encode_query(self, query_text: str) -> List[float]:
-        """쿼리 텍스트 임베딩"""
+    def get_candidate_ids(self, where: Dict[str, Any], limit: int) -> List[str]:
+        """메타데이터 필터에 맞는 문서 ID 조회 (임베딩 없이, 최대 limit개)"""
+        result = self.collection.get(where=where, limit=limit, include=[])
+        return result["ids"]
+    
+    def encode_query(self, query_text: str) -> List[float]:
+        """
+        쿼리 텍스트 임베딩
+        
+        실제 모델 결과만 캐시 (일시적 오류로 Mock 대체된 벡터가 프로세스 수명 동안 남지 않도록)
+        """
+        if not (self._is_gpu_environment and self._embedding_model is not None):
+            return self._encode_with_mock(query_text)
+        
         try:
-            if self._is_gpu_environment and self._embedding_model is not None:
-                return self._encode_with_real_model(query_text)
-            else:
-                return self._encode_with_mock(query_text)
-                
+            return list(self._encode_query_cached(query_text))
         except Exception as e:
             logger.error(f"❌ 임베딩 생성 실패: {e}")
             logger.warning("Mock 임베딩으로 대체")
             return self._encode_with_mock(query_text)
     
+    def _encode_query_uncached(self, query_text: str) -> Tuple[float, ...]:
+        """실제 모델 쿼리 임베딩 (캐시 저장용으로 tuple 반환, 실패 시 예외 → 캐시되지 않음)"""
+        return tuple(self._encode_with_real_model(query_text))
+    
     def _encode_with_real_model(self, query_text: str) -> List[float]:
         """실제 모델로 임베딩 생성"""
         try:
-            embeddings = self._embedding_model.encode([query_text])
-            embedding_vector = embeddings[0].tolist()
+            if self._embed_batcher is not None:
+                embedding_vector = self._embed_batcher.embed(query_text)
+            else:
+                embeddings = self._embedding_model.encode([query_text])
+                embedding_vector = embeddings[0].tolist()
             
             logger.debug(f"✅ 실제 모델 임베딩 생성: {len(embedding_vector)}차원")
             return embedding_vector
@@ -221,19 +271,48 @@ class VectorClient:
             logger.error(f"Mock 임베딩 생성 실패: {e}")
             return [0.0] * 3584
     
+    def encode_documents(self, documents: List[str], batch_size: int = 256) -> np.ndarray:
+        """
+        문서 임베딩 일괄 생성 (초기 데이터 로딩용)
+        
+        전체 문서를 한 번의 모델 호출로 인코딩해 배치별 재호출 비용을 없앰
+        """
+        if self._is_gpu_environment and self._embedding_model:
+            return self._embedding_model.encode(
+                documents,
+                batch_size=batch_size,
+                show_progress_bar=True,
+                convert_to_numpy=True
+            )
+        return np.asarray([self._encode_with_mock(doc) for doc in documents], dtype=np.float32)
+    
+    def get_max_batch_size(self) -> Optional[int]:
+        """ChromaDB가 허용하는 한 번의 add 최대 건수 (확인 불가 시 None)"""
+        try:
+            return self.client.get_max_batch_size()
+        except Exception:
+            return None
+    
     def add_documents(
         self,
         documents: List[str],
         metadatas: List[Dict[str, Any]],
-        ids: Optional[List[str]] = None
+        ids: Optional[List[str]] = None,
+        embeddings: Optional[List[List[float]]] = None
     ) -> None:
-        """문서 추가 (초기 데이터 로딩용)"""
+        """
+        문서 추가 (초기 데이터 로딩용)
+        
+        embeddings를 넘기면 임베딩 생성 단계를 건너뜀
+        """
         try:
             if ids is None:
                 ids = [f"doc_{i}" for i in range(len(documents))]
             
             # 임베딩 생성
-            if self._is_gpu_environment and self._embedding_model:
+            if embeddings is not None:
+                pass
+            elif self._is_gpu_environment and self._embedding_model:
                 embeddings = self._embedding_model.encode(documents).tolist()
             else:
                 embeddings = [self._encode_with_mock(doc) for doc in documents]
@@ -271,21 +350,27 @@ class VectorClient:
 
 # 싱글톤 인스턴스
 _vector_client_instance = None
+_vector_client_lock = threading.Lock()
 
 
 def get_vector_client() -> VectorClient:
-    """VectorClient 싱글톤 반환"""
+    """VectorClient 싱글톤 반환 (시작 시 워밍업 스레드와 동시 호출 대비 잠금)"""
     global _vector_client_instance
     
-    if _vector_client_instance is None:
-        logger.info("🔧 VectorClient 인스턴스 생성 중...")
-        _vector_client_instance = VectorClient()
-        
-        info = _vector_client_instance.get_collection_info()
-        logger.info(f"📊 환경: {info.get('environment')}")
-        logger.info(f"📊 연결: {info.get('connection_type')}")
-        logger.info(f"📊 모델: {info.get('embedding_model')}")
-        logger.info(f"📊 컬렉션: {info.get('name')} ({info.get('count')}개 문서)")
+    if _vector_client_instance is not None:
+        return _vector_client_instance
+    
+    with _vector_client_lock:
+        if _vector_client_instance is None:
+            logger.info("🔧 VectorClient 인스턴스 생성 중...")
+            instance = VectorClient()
+            
+            info = instance.get_collection_info()
+            logger.info(f"📊 환경: {info.get('environment')}")
+            logger.info(f"📊 연결: {info.get('connection_type')}")
+            logger.info(f"📊 모델: {info.get('embedding_model')}")
+            logger.info(f"📊 컬렉션: {info.get('name')} ({info.get('count')}개 문서)")
+            _vector_client_instance = instance
     
     return _vector_client_instance
 